@@ -6,19 +6,39 @@ from discord.ext import commands
 import asyncpg
 import discord
 
+from utils.connection import LazyConnection, PoolStats
+from utils.catalog import Catalog
+from utils.plonks import PlonkCache
+from utils.router import InteractionRouter
+from utils.outbound import OutboundQueue
+from utils.events import EventSink, maintain_statistics, maintain_statistics_loop
 from utils.context import Context
+from utils.sampler import EncounterSampler, WeightedSampler
+from utils.statements import StatementRegistry, STATEMENTS
+from utils.trainers import TrainerCache
+from utils.users import UserCache
 from utils import errors
 import config
 
 
 async def set_codecs(con):
-    await con.set_type_codec('json', schema='pg_catalog',
-                             encoder=lambda v: json.dumps(v),
-                             decoder=lambda v: json.loads(v))
+    for type_ in ('json', 'jsonb'):
+        await con.set_type_codec(type_, schema='pg_catalog',
+                                 encoder=lambda v: json.dumps(v),
+                                 decoder=lambda v: json.loads(v))
+
+
+async def init_connection(con):
+    await set_codecs(con)
+    bot.statements.register(con)
 
 
 class SurvivorBot(commands.Bot):
     async def logout(self):
+        await self.plonks.close()
+        await self.trainers.close()
+        await self.events.close()
+        self.statistics_task.cancel()
         await self.db_pool.close()
         await super().logout()
 
@@ -40,7 +60,11 @@ class SurvivorBot(commands.Bot):
         print(f'{len(self.cogs)} active cogs with {len(self.commands)} commands')
         print('------')
 
+    async def on_reaction_add(self, reaction, user):
+        self.router.dispatch_reaction(reaction, user)
+
     async def on_message(self, message):
+        self.router.dispatch_message(message)
         if not self.ready:
             return
 
@@ -52,16 +76,15 @@ class SurvivorBot(commands.Bot):
                 return
         else:
             message.content = ' '.join([split[0].lower(), *split[1:]])
+        if message.guild is not None and self.plonks.is_plonked(message.guild.id, message.author.id):
+            return
         ctx = await self.get_context(message, cls=Context)
-        ctx.con = await bot.db_pool.acquire()
+        ctx.con = LazyConnection(self.db_pool, self.pool_stats)
 
-        if ctx.guild is not None:
-            plonked = await ctx.con.fetchval('''
-                SELECT EXISTS(SELECT * FROM plonks WHERE user_id = $1 and guild_id = $2)
-                ''', message.author.id, message.guild.id)
-            if plonked:
-                return
-        await self.invoke(ctx)
+        try:
+            await self.invoke(ctx)
+        finally:
+            await ctx.con.release()
 
     async def on_command_error(self, ctx, error):
         if isinstance(error, commands.CommandOnCooldown):
@@ -105,7 +128,28 @@ description = 'Survivor Bot - Created by MadWookie & sgtlaggy.'
 bot = SurvivorBot(command_prefix=commands.when_mentioned_or('!'), description=description, formatter=formatter,
                   request_offline_members=True)
 bot.ready = False
-bot.db_pool = bot.loop.run_until_complete(asyncpg.create_pool(config.dsn, init=set_codecs))
+bot.router = InteractionRouter(bot.loop)
+bot.outbound = OutboundQueue(bot.loop)
+bot.statements = StatementRegistry(STATEMENTS)
+bot.pool_stats = PoolStats()
+bot.trainers = TrainerCache(bot.statements, config.dsn)
+bot.user_cache = UserCache(bot)
+bot.db_pool = bot.loop.run_until_complete(asyncpg.create_pool(config.dsn, init=init_connection,
+                                                               min_size=getattr(config, 'db_pool_min_size', 10),
+                                                               max_size=getattr(config, 'db_pool_max_size', 10)))
+bot.catalog = bot.loop.run_until_complete(Catalog.load(bot.db_pool))
+bot.plonks = PlonkCache(config.dsn)
+bot.loop.run_until_complete(bot.plonks.start())
+bot.loop.run_until_complete(bot.trainers.start())
+retention = getattr(config, 'statistics_retention_days', None)
+retention = None if retention is None else datetime.timedelta(days=retention)
+bot.loop.run_until_complete(maintain_statistics(bot.db_pool, retention=retention))
+bot.statistics_task = bot.loop.create_task(maintain_statistics_loop(bot.db_pool, retention=retention))
+bot.events = EventSink(bot.db_pool)
+bot.events.start(bot.loop)
+bot.encounters = EncounterSampler(bot.catalog, getattr(config, 'encounter_weights', None),
+                                  getattr(config, 'guild_encounter_weights', None))
+bot.rewards = WeightedSampler(bot.catalog.rewards)
 
 for ext in initial_extensions:
     try:
@@ -117,7 +161,6 @@ for ext in initial_extensions:
 
 @bot.after_invoke
 async def after_invoke(ctx):
-    await bot.db_pool.release(ctx.con)
     if getattr(ctx, '_delete_ctx', True):
         try:
             await ctx.message.delete()
@@ -0,0 +1,90 @@
+"""Measures the memory footprint of a PC of :class:`utils.orm.FoundPokemon`.
+
+The PC is built twice from the same `found` rows, once with the old
+`__dict__`-copying model and once with the slotted model that shares
+a :class:`utils.catalog.Species`. No DB or Discord connection is needed.
+
+Usage: python -m benchmarks.memory [count]
+"""
+from types import SimpleNamespace
+import tracemalloc
+import random
+import sys
+
+from utils.catalog import Catalog
+from utils.orm import FoundPokemon
+from utils.stats import STATS
+
+SPECIES = 807
+TYPES = ('Normal', 'Fire', 'Water', 'Grass')
+
+
+def make_catalog():
+    types = [{'name': name, 'color': i * 0x111111, 'noeffect': [], 'effective': [], 'ineffective': []}
+             for i, name in enumerate(TYPES)]
+    natures = [{'mod': mod, 'name': f'Nature {mod}', 'increase': STATS[1 + mod // 5], 'decrease': STATS[1 + mod % 5]}
+               for mod in range(25)]
+    pokemon = []
+    for num in range(1, SPECIES + 1):
+        row = {'num': num, 'base_name': f'Pokemon {num}', 'form': None, 'form_id': 0, 'generation': 1 + num // 152,
+               'type': [TYPES[num % len(TYPES)]], 'legendary': num % 50 == 0, 'mythical': num % 100 == 0}
+        for stat in STATS:
+            row[f'base_{stat}'] = 50 + num % 50
+            row[f'{stat}_yield'] = num % 3
+        row['xp_yield'] = 64
+        pokemon.append(row)
+    return Catalog(types=types, natures=natures, pokemon=pokemon, items=(), rewards=(), evolutions=(), moves=())
+
+
+def make_records(count):
+    records = []
+    for i in range(count):
+        personality = random.getrandbits(32)
+        exp = random.randrange(100000)
+        rec = {'id': i + 1, 'num': random.randint(1, SPECIES), 'name': None, 'form_id': 0, 'ball': 'Pokeball',
+               'exp': exp, 'item': None, 'party_position': None, 'owner': 1, 'original_owner': 1, 'moves': [],
+               'personality': personality, 'shiny': False, 'nature_mod': personality % 25,
+               'level': max(int(((exp + 1) * 2) ** (1 / 3)), 1)}
+        for stat in STATS:
+            rec[f'{stat}_iv'] = random.randint(0, 31)
+            rec[f'{stat}_ev'] = 0
+        records.append(rec)
+    return records
+
+
+class DictFoundPokemon:
+    """The previous model, which copied the record and the species into `__dict__`."""
+    def __init__(self, ctx, rec):
+        catalog = ctx.bot.catalog
+        self.ctx = ctx
+        self.__dict__.update(rec)
+        species = catalog.get_pokemon(self.num, self.form_id)
+        self.__dict__.update({key: getattr(species, key) for key in species.COLUMNS}, colors=species.colors)
+        self.nature = catalog.get_nature(self.nature_mod)
+        self.evolution_info = catalog.evolution_graph.successors(self.num)
+        self.color = species.color
+        self.star = species.star
+
+
+def measure(cls, ctx, records):
+    tracemalloc.start()
+    mons = [cls(ctx, rec) for rec in records]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del mons
+    return size
+
+
+def main(count=10000):
+    random.seed(0)
+    ctx = SimpleNamespace(bot=SimpleNamespace(catalog=make_catalog()))
+    records = make_records(count)
+    print(f'{count} Pokemon')
+    results = [(cls.__name__, measure(cls, ctx, records)) for cls in (DictFoundPokemon, FoundPokemon)]
+    for name, size in results:
+        print(f'{name:>18}: {size / 1024 / 1024:8.2f} MiB total, {size / count:7.1f} bytes per Pokemon')
+    print(f'{"saved":>18}: {100 * (1 - results[1][1] / results[0][1]):8.1f}%')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -88,12 +88,11 @@ class Help(formatter.HelpFormatter):
         help_msg = await dest.send(content=content, embed=embeds[0], delete_after=60)
         page_msg = await dest.send("There are {} help pages. Send a number to see the corresponding page. Send any other message to exit.".format(len(embeds)), delete_after=60)
 
-        async def is_me(msg):
-            if msg.author == self.context.me and msg.channel == dest:
-                return True
         while True:
-            await asyncio.sleep(.5)
-            reply = await self.bot.wait_for('message', check=is_me)
+            try:
+                reply = await self.bot.router.wait_for_message(help_msg.channel.id, self.context.author.id, timeout=60)
+            except asyncio.TimeoutError:
+                break
             try:
                 page_number = int(reply.content) - 1
                 await reply.delete()
@@ -1,3 +1,4 @@
+from collections import Counter
 import datetime
 import random
 
@@ -10,12 +11,6 @@ from utils.utils import wrap, unique, emoji_trans
 from utils.orm import Trainer
 
 
-async def get_rewards(ctx):
-    return await ctx.con.fetch("""
-        SELECT * FROM rewards
-        """)
-
-
 class Inventory(Menus):
     def __init__(self, bot):
         self.bot = bot
@@ -38,9 +33,7 @@ class Inventory(Menus):
         thumbnail = 'http://pokebot.xyz/static/img/shop.png'
         title = f'{player_name} | {inventory["money"]}\ua750'
         description = 'Select items to buy{}.'.format(f' in multiples of {multiple}' if multiple > 1 else '')
-        all_items = await ctx.con.fetch("""
-            SELECT name, price FROM items WHERE price != 0 ORDER BY price
-            """)
+        all_items = sorted((item for item in ctx.bot.catalog.items if item['price'] != 0), key=lambda i: i['price'])
         rand = random.Random(datetime.date.today().toordinal())
         balls = []
         not_balls = []
@@ -64,20 +57,20 @@ class Inventory(Menus):
         if not selected:
             return
         bought = []
+        deltas = Counter()
         total = 0
         for item in set(selected):
             count = selected.count(item) * multiple
             item_info = items[item]
             item_price, item_name = item_info['price'], item_info['name']
             price = item_price * count
-            after = inventory['money'] - price
-            if after < 0:
+            if inventory['money'] - total - price < 0:
                 continue
             total += price
             bought.extend([item] * count)
-            inventory['money'] = after
-            inventory[item_name] += count
-        if total == 0:
+            deltas[item_name] += count
+        deltas['money'] -= total
+        if total == 0 or not await player_data.update_inventory(deltas):
             await ctx.send(f"{player_name} didn't buy anything because they're too poor.", delete_after=60)
         else:
             display = []
@@ -90,7 +83,6 @@ class Inventory(Menus):
                            delete_after=60)
             bought_items = {item: bought.count(item) for item in bought}
             await ctx.log_event('shop_purchased', items=bought_items, spent=total)
-            await player_data.set_inventory(inventory)
 
 ###################
 #                 #
@@ -98,7 +90,7 @@ class Inventory(Menus):
 #                 #
 ###################
 
-    @shop.command()
+    @shop.group(invoke_without_command=True)
     @pokechannel()
     async def sell(self, ctx):
         spacer = SPACER * 24
@@ -106,7 +98,6 @@ class Inventory(Menus):
         trainer = await Trainer.from_user_id(ctx, ctx.author.id)
         user_pokemon = await trainer.get_pokemon()
         await ctx.log_event('shop_accessed', multiple=0)
-        inventory = trainer.inventory
         header = f'**{player_name}**,\nSelect Pokemon to sell.\n' + wrap(f'**100**\ua750 normal | **600**\ua750'
                                                                          f' Legendary {STAR} | **1000**\ua750'
                                                                          f' Mythical {GLOWING_STAR}', spacer, sep='\n')
@@ -124,36 +115,45 @@ class Inventory(Menus):
                                    code=False, multi=True, return_from=user_pokemon, display=names)
         if not selected:
             return
-        named = []
-        sold = []
-        sold_objs = []
-        total = 0
         selected = unique(selected, key=lambda m: m.id)
-        for mon in sorted(selected, key=lambda m: m.num):
-            if mon.shiny:
-                total += 1000
-            if mon.mythical:
-                total += 1000
-            elif mon.legendary:
-                total += 600
-            else:
-                total += 100
-            sold_objs.append(mon)
-
-            if mon.num not in named:
-                count = 0
-                for m in selected:
-                    if m.num == mon.num:
-                        count += 1
-                shiny = GLOWING_STAR if mon.shiny else ''
-                sold.append(f"{mon.display_name}{shiny}{f' x{count}' if count > 1 else ''}")
-                named.append(mon.num)
-        for mon in sold_objs:
-            await mon.transfer_ownership(None)
-        inventory['money'] += total
-        await ctx.log_event('shop_sold', pokemon=[m.id for m in sold_objs], received=total)
-        await trainer.set_inventory(inventory)
-        await ctx.send(f'{player_name} sold the following for {total}\ua750:\n' + '\n'.join(sold), delete_after=60)
+        sale = await trainer.sell_pokemon(m.id for m in selected)
+        if not sale.ids:
+            await ctx.send(f"{player_name} doesn't own those pokemon anymore.", delete_after=60)
+            return
+        sold_ids = set(sale.ids)
+        counts = Counter((m.num, m.display_name, m.shiny) for m in selected if m.id in sold_ids)
+        sold = [f"{name}{GLOWING_STAR if shiny else ''}{f' x{count}' if count > 1 else ''}"
+                for (_, name, shiny), count in sorted(counts.items())]
+        await ctx.log_event('shop_sold', pokemon=sale.ids, received=sale.total)
+        await ctx.send(f'{player_name} sold the following for {sale.total}\ua750:\n' + '\n'.join(sold),
+                       delete_after=60)
+
+    @sell.command(name='duplicates', aliases=['dupes'])
+    @pokechannel()
+    async def sell_duplicates(self, ctx, keep: int = 1):
+        """Sell every non-shiny pokemon beyond the first few of each kind.
+
+        The pokemon with the most experience are kept, and party pokemon are never sold.
+        """
+        player_name = ctx.author.name
+        if keep < 0:
+            await ctx.send('You must keep at least 0 of each pokemon.', delete_after=60)
+            return
+        trainer = await Trainer.from_user_id(ctx, ctx.author.id)
+        await ctx.log_event('shop_accessed', multiple=0)
+        sale = await trainer.sell_duplicates(keep)
+        if not sale.ids:
+            await ctx.send(f"{player_name} doesn't have any duplicates to sell.", delete_after=60)
+            return
+        sold = []
+        for num, count in sorted(Counter(sale.nums).items()):
+            mon = ctx.bot.catalog.get_pokemon(num)
+            sold.append(f"{mon.base_name}{mon.star}{f' x{count}' if count > 1 else ''}")
+        if len(sold) > 20:
+            sold[20:] = [f'and {len(sold) - 20} more...']
+        await ctx.log_event('shop_sold', pokemon=sale.ids, received=sale.total)
+        await ctx.send(f'{player_name} sold {len(sale.ids)} pokemon for {sale.total}\ua750:\n' + '\n'.join(sold),
+                       delete_after=60)
 
     @commands.command(aliases=['inv', 'bag'])
     @pokechannel()
@@ -162,9 +162,7 @@ class Inventory(Menus):
         await ctx.log_event('inventory_accessed')
         player_data = await Trainer.from_user_id(ctx, ctx.author.id)
         inv = player_data.inventory
-        all_items = await ctx.con.fetch("""
-            SELECT name FROM items ORDER BY id ASC
-            """)
+        all_items = ctx.bot.catalog.items
         em = discord.Embed(title=f'{ctx.author.name} | {inv["money"]}\ua750')
         items = []
         for item in all_items[1:]:
@@ -188,15 +186,11 @@ class Inventory(Menus):
         """Collect a reward for free every 3 hours!"""
         user = ctx.author
         player_data = await Trainer.from_user_id(ctx, user.id)
-        inv = player_data.inventory
-        reward = await ctx.con.fetchrow("""
-            SELECT * FROM rewards ORDER BY random() LIMIT 1
-            """)
+        reward = ctx.bot.rewards.sample()
         item, count = reward['name'], reward['num']
         item_name = 'Pokédollar' if item == 'money' else item
-        inv[item] = inv.get(item, 0) + count
+        await player_data.update_inventory({item: count})
         await ctx.log_event('reward_collected', item=item, amount=count)
-        await player_data.set_inventory(inv)
         await ctx.send(f"{user.name} has received {count} **{item_name}{'s' if count != 1 else ''}**!", delete_after=60)
 
 
@@ -64,6 +64,7 @@ class Main:
         except asyncpg.UniqueViolationError:
             await ctx.send('User is already plonked.')
         else:
+            self.bot.plonks.add(ctx.guild.id, user.id)
             await ctx.send('User has been plonked.')
 
     @commands.command()
@@ -75,6 +76,7 @@ class Main:
                 DELETE FROM plonks WHERE guild_id = $1 and user_id = $2
                 """, ctx.guild.id, user.id)
         deleted = int(res.split()[-1])
+        self.bot.plonks.discard(ctx.guild.id, user.id)
         if deleted:
             await ctx.send('User is no longer plonked.')
         else:
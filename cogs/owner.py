@@ -1,8 +1,11 @@
+import importlib
+
 from discord.ext import commands
 import discord
 
 from utils.orm import FoundPokemon
 from utils import checks
+import config
 
 
 class Owner:
@@ -63,6 +66,14 @@ class Owner:
         else:
             await ctx.send(f'Cog {ext} unloaded.')
 
+    @commands.command(hidden=True)
+    async def reweight(self, ctx):
+        """Reload the encounter weights from the config."""
+        importlib.reload(config)
+        self.bot.encounters.configure(getattr(config, 'encounter_weights', None),
+                                      getattr(config, 'guild_encounter_weights', None))
+        await ctx.send('Encounter weights reloaded.')
+
 ###################
 #                 #
 # DATABASE        #
@@ -81,6 +92,34 @@ class Owner:
         val = await ctx.con.fetchval(sql)
         await ctx.send(val)
 
+    @commands.command(hidden=True)
+    async def statements(self, ctx):
+        """Show the prepared statement hits and misses."""
+        registry = self.bot.statements
+        rows = [f'{name}: {registry.hits[name]} hits, {registry.misses[name]} misses'
+                for name in sorted(registry.statements)]
+        hits, misses = sum(registry.hits.values()), sum(registry.misses.values())
+        rows.append(f'Total: {hits} hits, {misses} misses')
+        await ctx.send('```\n{}\n```'.format('\n'.join(rows)))
+
+    @commands.command(hidden=True)
+    async def poolstats(self, ctx):
+        """Show how long commands wait for and hold DB connections."""
+        stats = self.bot.pool_stats
+        rows = [f'Acquired: {stats.acquired} ({stats.held} held, {stats.waiting} waiting)',
+                f'Wait: {stats.average_wait * 1000:.2f}ms avg, {stats.max_wait * 1000:.2f}ms max',
+                f'Hold: {stats.average_hold * 1000:.2f}ms avg, {stats.max_hold * 1000:.2f}ms max']
+        await ctx.send('```\n{}\n```'.format('\n'.join(rows)))
+
+    @commands.command(hidden=True)
+    async def outbound(self, ctx):
+        """Show how far behind message edits, reactions and deletes are."""
+        queue = self.bot.outbound
+        rows = [f'Queued: {len(queue)} actions on {queue.active} messages',
+                f'Sent: {queue.sent} ({queue.failed} failed, {queue.merged} merged, {queue.dropped} dropped)',
+                f'Latency: {queue.average_latency * 1000:.2f}ms avg, {queue.max_latency * 1000:.2f}ms max']
+        await ctx.send('```\n{}\n```'.format('\n'.join(rows)))
+
     @commands.command()
     async def test(self, ctx, num: int):
         p = await FoundPokemon.from_id(ctx, num)
@@ -1,17 +1,17 @@
 from random import randint
 import asyncio
 import random
-import re
 
-import aiohttp
 import discord
 from discord.ext import commands
 from fuzzywuzzy import process
 
 from utils import errors
-from utils.orm import Pokemon, Trainer, FoundPokemon, xp_to_level, get_all_pokemon
+from utils.orm import Pokemon, Trainer, FoundPokemon, xp_to_level
 from utils.menus import Menus, STAR, GLOWING_STAR, SPARKLES, SPACER, ARROWS, DONE, CANCEL
 from utils.utils import wrap
+from utils.pcsearch import is_search, search_pokemon
+from utils.trade import settle_trade
 
 converter = commands.MemberConverter()
 
@@ -92,31 +92,29 @@ class PokemonGame(Menus):
             inv = trainer.inventory
             balls = [self.bot.get_emoji_named(ball) for ball in pokeballs if inv.get(ball)]
             can_react_with = [*balls, CANCEL]
-            for emoji in can_react_with:
-                await msg.add_reaction(emoji)
+            self.bot.outbound.add_reactions(msg, can_react_with)
             try:
-                def check(reaction, user):
-                    return (reaction.emoji in can_react_with and
-                            reaction.message.id == msg.id and
-                            user == ctx.author)
-                reaction, _ = await self.bot.wait_for('reaction_add', check=check, timeout=20)
+                reaction, _ = await self.bot.router.wait_for_reaction(msg.id, user_id=ctx.author.id,
+                                                                      emojis=can_react_with, timeout=20)
 
                 await ctx.log_event('item_used', item=reaction.emoji.name)
             except asyncio.TimeoutError:
                 embed.description = f'**{mon.display_name}**{mon.star}{shiny} escaped because you took too long!' \
                                     f' :stopwatch:'
-                await msg.edit(embed=embed, delete_after=60)
-                await msg.clear_reactions()
+                self.bot.outbound.edit(msg, embed=embed, delete_after=60)
+                self.bot.outbound.clear_reactions(msg)
                 return
-            await msg.clear_reactions()
+            self.bot.outbound.clear_reactions(msg)
             if reaction.emoji in balls:
-                inv[reaction.emoji.name] -= 1
-                await trainer.set_inventory(inv)
+                if not await trainer.update_inventory({reaction.emoji.name: -1}):
+                    embed.description = f"You don't have any {reaction.emoji} left!"
+                    self.bot.outbound.edit(msg, embed=embed)
+                    continue
                 catch_attempts += 1
                 if catch(mon, balls.index(reaction.emoji)):
                     embed.description = wrap(f'You caught **{mon.display_name}**{mon.star}{shiny} successfully!',
                                              reaction.emoji)
-                    await msg.edit(embed=embed, delete_after=60)
+                    self.bot.outbound.edit(msg, embed=embed, delete_after=60)
                     found = await trainer.add_caught_pokemon(mon, reaction.emoji.name)
                     await ctx.log_event('pokemon_caught', attempts=catch_attempts + 1, ball=reaction.emoji.name,
                                         id=found.id)
@@ -125,16 +123,16 @@ class PokemonGame(Menus):
                     escape_quotes = ['Oh no! The Pokémon broke free!', 'Aww... It appeared to be caught!',
                                      'Aargh! Almost had it!', 'Gah! It was so close, too!']
                     embed.description = random.choice(escape_quotes)
-                await msg.edit(embed=embed)
+                self.bot.outbound.edit(msg, embed=embed)
             else:
                 embed.description = wrap(f'You ran away from **{mon.display_name}**{mon.star}{shiny}!', ':chicken:')
-                await msg.edit(embed=embed, delete_after=60)
+                self.bot.outbound.edit(msg, embed=embed, delete_after=60)
                 await ctx.log_event('pokemon_fled', attempts=catch_attempts + 1, num=mon.num, shiny=mon.shiny)
                 break
         else:
             embed.description = f'**{mon.display_name}**{mon.star}{shiny} has escaped!'
             await ctx.log_event('pokemon_fled', attempts=catch_attempts + 1, num=mon.num, shiny=mon.shiny)
-            await msg.edit(embed=embed, delete_after=60)
+            self.bot.outbound.edit(msg, embed=embed, delete_after=60)
 
 ###################
 #                 #
@@ -149,14 +147,14 @@ class PokemonGame(Menus):
         member = member or ctx.author
         await ctx.log_event('pc_accessed', query_type='member', query=member.id)
 
-        total_pokemon = len(await get_all_pokemon(ctx))
+        total_pokemon = ctx.bot.catalog.summary.total
         trainer = await Trainer.from_user_id(ctx, member.id)
-        found = await trainer.get_pokemon()
-        total_found = len(found)
+        found = await trainer.get_pc_counts()
+        total_found = found.total
         remaining = total_pokemon - total_found
 
-        legendaries = len([m for m in found if m.legendary])
-        mythics = len([m for m in found if m.mythical])
+        legendaries = found.legendary
+        mythics = found.mythical
 
         header = f"__**{member.name}'s PC**__"
         if total_found == 0:
@@ -175,23 +173,20 @@ class PokemonGame(Menus):
         header = '\n'.join([header, 'Use **!pokedex** to see which Pokémon you\'ve encountered!\nUse **!pokedex** ``#``'
                                     ' to take a closer look at a Pokémon!', key, counts])
 
-        options = []
-        done = []
-        for mon in found:
-            if mon.display_name in done and mon.party_position is None:
-                continue
-            if mon.party_position is None:
-                mon_count = sum(m.display_name == mon.display_name for m in found if m.party_position is None)
-                done.append(mon.display_name)
-            elif mon.party_position is not None:
-                mon_count = 1
-            shiny = mon.shiny
-            shiny = SPARKLES if shiny else ''
-            count = f" x{mon_count}" if mon_count > 1 else ''
-            name = mon.display_name
-            options.append("{} **{}.** {}{}{}{}".format('' if mon.party_position is not None else '',
-                                                        mon.num, name, mon.star, shiny, count))
-        await self.menu(options, ctx.author, ctx.channel, 0, per_page=20, code=False, header=header)
+        def format_entry(entry):
+            species = ctx.bot.catalog.get_pokemon(entry['num'], entry['form_id'])
+            name = species.display_name
+            if entry['name'] is not None:
+                name = f"{entry['name']} ({name})"
+            shiny = SPARKLES if entry['shiny'] else ''
+            count = f" x{entry['count']}" if entry['count'] > 1 else ''
+            return "{} **{}.** {}{}{}{}".format('' if entry['party_position'] is not None else '',
+                                                entry['num'], name, species.star, shiny, count)
+
+        pages = trainer.get_pc_pages(format_entry, per_page=20)
+        # Pages are read on their own connections, so none is held while the menu waits.
+        await ctx.con.release()
+        await self.menu(pages, ctx.author, ctx.channel, 0, code=False, header=header)
 
     async def get_pc_info_embed(self, mon):
         pokedex = self.bot.get_emoji_named('Pokedex')
@@ -233,47 +228,38 @@ class PokemonGame(Menus):
     @pc.command(name='info')
     @pokechannel()
     async def pc_info(self, ctx, *, query: str):
-        """Display information for a specific Pokemon from the user's PC."""
+        """Display information for a specific Pokemon from the user's PC.
+
+        Search with filters like `shiny`, `type:fire`, `level:10-20` or `attack>120`,
+        combined with `and`, `or` and `not`."""
         trainer = await Trainer.from_user_id(ctx, ctx.author.id)
+        mon_list = None
+        invalid_query = None
         if query.isdigit():  # If the user enters a Pokemon's number.
             query_type = 'num'
             query = int(query)
             mon_list = await FoundPokemon.from_num(ctx, query)
-        elif any(comparator in query for comparator in ['<', '>', '=']):  # Advanced query
-            valid_stats = ['hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed']
-            query_type = 'statistic'
-
-            def query_repl(match):
-                if match.group(1) not in valid_stats or not match.group(3).isdigit() or \
-                        match.group(2) not in ['>', '<', '=']:
-                    return ''
-                return f'{match.group(1)} {match.group(2)} {match.group(3)}'
-
-            result = re.sub(r"([^\s]+)\s*?([<>=])\s*?([^\s]+)", query_repl, query)
-            if not result:
-                return await ctx.send('Invalid query. The value must be a number. '
-                                      '\nValid statistics include: `{}`'.format(', '.join(valid_stats)))
-            stat, comparator, value = result.split(' ')
-            if comparator == '=':
-                comparator += '='
-            found = await trainer.get_pokemon()
-            mon_list = []
-            for record in found:
-                stats = record.stats
-                if eval(f"""{stats[stat]} {comparator} {value}"""):
-                    mon_list.append(record)
-            if not mon_list:
-                return await ctx.send(f'Pokemon with `{result}` does not exist.', delete_after=60)
-        else:  # Fuzzy match the query with all the Pokemon in the user's PC.
+        elif is_search(query):  # Advanced query, see utils.pcsearch.PCSearch
+            query_type = 'search'
+            try:
+                records = await search_pokemon(ctx, ctx.author.id, query)
+            except errors.InvalidQuery as e:
+                invalid_query = e  # Could still be a name like `Type: Null`.
+            else:
+                mon_list = [FoundPokemon.from_record(ctx, r) for r in records]
+                if not mon_list:
+                    return await ctx.send(f'Pokemon with `{query}` do not exist.', delete_after=60)
+        if mon_list is None:  # Fuzzy match the query with all the Pokemon in the user's PC.
             query_type = 'fuzzy'
-            pokemon_names = [p.base_name for p in await get_all_pokemon(ctx)]
-            result = process.extractOne(query, pokemon_names)
-            if result[1] < 70:
+            result = await ctx.bot.catalog.names.search(query)
+            if result is None:
+                if invalid_query is not None:
+                    return await ctx.send(f'Invalid query. {invalid_query}', delete_after=60)
                 return await ctx.send(f'Pokemon {query} does not exist.', delete_after=60)
             pokemon = await ctx.con.fetch("""
                 SELECT * FROM found WHERE owner=$1 AND num=ANY(SELECT num FROM pokemon WHERE base_name=$2) ORDER BY party_position, num, form_id
-                """, ctx.author.id, result[0])
-            mon_list = [await FoundPokemon.from_id(ctx, p['id']) for p in pokemon]
+                """, ctx.author.id, result[0].base_name)
+            mon_list = [FoundPokemon.from_record(ctx, p) for p in pokemon]
 
         await ctx.log_event('pc_accessed', query=query, query_type=query_type)
 
@@ -303,41 +289,41 @@ class PokemonGame(Menus):
             party = await trainer.get_pokemon(party=True)
             em, im = await self.get_pc_info_embed(chosen_mon)
             em.set_image(url=im)
-            await msg.edit(embed=em, delete_after=120)
-            await msg.add_reaction('\N{PENCIL}')
+            self.bot.outbound.edit(msg, embed=em, delete_after=120)
+            reactions = ['\N{PENCIL}']
             up_rxn = None
             down_rxn = None
 
             evo_info = chosen_mon.evolution_info
-            evo_dict = {info['item']: [info['next'], self.bot.get_emoji_named(info['item'])] for info in evo_info
-                        if info['item'] is not None}
+            evo_dict = {edge.item: [edge.next, self.bot.get_emoji_named(edge.item)] for edge in evo_info
+                        if edge.item is not None}
             trainer = await Trainer.from_user_id(ctx, ctx.author.id)
             for key, val in evo_dict.items():
                 if key in trainer.inventory:
-                    await msg.add_reaction(val[1])
+                    reactions.append(val[1])
 
             if chosen_mon.party_position is not None:
-                await msg.add_reaction('\N{CROSS MARK}')
+                reactions.append('\N{CROSS MARK}')
                 cur_index = [p.id for p in party].index(chosen_mon.id)
                 try:
                     if party[cur_index + 1]:
-                        await msg.add_reaction(ARROWS[2])
+                        reactions.append(ARROWS[2])
                         up_rxn = True
                 except IndexError:
                     pass
                 try:
                     if party[cur_index - 1] and cur_index != 0:
-                        await msg.add_reaction(ARROWS[3])
+                        reactions.append(ARROWS[3])
                         down_rxn = True
                 except IndexError:
                     pass
             else:
-                await msg.add_reaction('\N{WHITE HEAVY CHECK MARK}')
-            await msg.add_reaction('\N{BLACK SQUARE FOR STOP}')
+                reactions.append('\N{WHITE HEAVY CHECK MARK}')
+            reactions.append('\N{BLACK SQUARE FOR STOP}')
+            self.bot.outbound.add_reactions(msg, reactions)
 
             try:
-                rxn, user = await self.bot.wait_for('reaction_add', timeout=115,
-                                                    check=lambda r, u: u.id == ctx.author.id and r.message.id == msg.id)
+                rxn, user = await self.bot.router.wait_for_reaction(msg.id, user_id=ctx.author.id, timeout=115)
             except asyncio.TimeoutError:
                 break
 
@@ -347,15 +333,15 @@ class PokemonGame(Menus):
                 em.color = embed.color
                 em.description = 'Enter a nickname for your Pokemon.'
                 em.set_image(url=im)
-                await msg.edit(embed=em, delete_after=120)
+                self.bot.outbound.edit(msg, embed=em, delete_after=120)
 
                 try:
-                    response = await self.bot.wait_for('message', timeout=115, check=lambda m: m.author.id == ctx.author.id)
+                    response = await self.bot.router.wait_for_message(ctx.channel.id, ctx.author.id, timeout=115)
                 except asyncio.TimeoutError:
                     break
                 await chosen_mon.set_name(response.content)
 
-                await response.delete()
+                self.bot.outbound.delete(response)
                 break
             elif str(rxn) == '\N{WHITE HEAVY CHECK MARK}':
                 if len(party_pokemon) >= self.max_party_size:
@@ -396,28 +382,20 @@ class PokemonGame(Menus):
                     await chosen_mon.set_party_position(pos - 1)
             elif evo_dict and rxn.emoji in [evo_dict[e][1] for e in evo_dict]:
                 name = process.extractOne(rxn.emoji.name, evo_dict.keys())[0]
+                if not await trainer.update_inventory({name: -1}):
+                    await ctx.send(f"You don't have any {rxn.emoji} left!")
+                    break
                 evolved = await chosen_mon.check_evolve()
                 if evolved is not None:
                     await chosen_mon.evolve(evolved)
-                inv = trainer.inventory
-                inv[name] -= 1
                 await ctx.log_event('item_used', item=name)
-                if inv[name] == 0:
-                    del inv[name]
-                await trainer.set_inventory(inv)
                 break
             else:
                 break
 
-            try:
-                await msg.clear_reactions()
-            except:
-                pass
+            self.bot.outbound.clear_reactions(msg)
 
-        try:
-            await msg.delete()
-        except:
-            pass
+        self.bot.outbound.delete(msg)
 
 ###################
 #                 #
@@ -450,8 +428,7 @@ class PokemonGame(Menus):
         await msg.add_reaction('\N{CROSS MARK}')
 
         try:
-            rxn, usr = await self.bot.wait_for('reaction_add', timeout=115,
-                                               check=lambda r, u: r.message.id == msg.id and u.id == ctx.author.id)
+            rxn, usr = await self.bot.router.wait_for_reaction(msg.id, user_id=ctx.author.id, timeout=115)
         except asyncio.TimeoutError:
             await msg.delete()
             return
@@ -487,15 +464,15 @@ class PokemonGame(Menus):
 
         member = await poke_converter(ctx, member) or ctx.author
 
-        total_pokemon = len(await get_all_pokemon(ctx))
+        total_pokemon = ctx.bot.catalog.summary.total
         if isinstance(member, discord.Member):
             trainer = await Trainer.from_user_id(ctx, member.id)
             await ctx.log_event('pokedex_accessed', query_type='member', query=member.id, shiny=False)
-            seen = await trainer.get_pokemon(seen=True)
-            total_found = len(seen)
+            seen = await trainer.get_seen_counts()
+            total_found = seen.total
 
-            legendaries = sum(1 for m in seen if m.legendary and not m.mythical)
-            mythicals = sum(1 for m in seen if m.mythical)
+            legendaries = seen.legendary
+            mythicals = seen.mythical
 
             header = f"__**{member.name}'s Pokedex**__"
             if total_found == 0:
@@ -514,11 +491,14 @@ class PokemonGame(Menus):
                           f' | **{mythicals}** Mythical {GLOWING_STAR}', spacer, sep='\n')
             header = '\n'.join([header, 'Use **!pc** to see which Pokémon you own!\nUse **!pokedex** ``#`` to take a closer look at a Pokémon!', key, counts])
 
-            options = []
-            for mon in seen:
-                options.append("**{}.** {}{}".format(
-                    mon.num, mon.display_name, mon.star))
-            await self.menu(options, ctx.author, ctx.channel, 0, per_page=20, code=False, header=header)
+            def format_entry(entry):
+                mon = ctx.bot.catalog.get_pokemon(entry['num'])
+                return "**{}.** {}{}".format(mon.num, mon.display_name, mon.star)
+
+            pages = trainer.get_seen_pages(format_entry, per_page=20, total=total_found)
+            # Pages are read on their own connections, so none is held while the menu waits.
+            await ctx.con.release()
+            await self.menu(pages, ctx.author, ctx.channel, 0, code=False, header=header)
             return
         elif isinstance(member, int):
             query_type = 'num'
@@ -529,12 +509,10 @@ class PokemonGame(Menus):
             info = await Pokemon.from_num(ctx, member)
         elif isinstance(member, str):
             query_type = 'fuzzy'
-            pokemon_names = [p.base_name for p in await get_all_pokemon(ctx)]
-            result = list(process.extractOne(member, pokemon_names))
-            if result[1] < 70:
+            try:
+                info = await Pokemon.from_name(ctx, member)
+            except errors.PokemonNotFound:
                 return await ctx.send(f'Pokemon {member} does not exist.')
-            pokemon_number = await Pokemon.from_name(ctx, result[0])
-            info = await Pokemon.from_num(ctx, pokemon_number.num)
             image = self.image_path.format('normal', info.num, 0)
         else:
             query_type = None
@@ -553,7 +531,7 @@ class PokemonGame(Menus):
         except ValueError:
             pass
 
-        total_pokemon = len(await get_all_pokemon(ctx))
+        total_pokemon = ctx.bot.catalog.summary.total
         if isinstance(pokemon, int):
             query_type = 'num'
             if 0 >= pokemon or pokemon > total_pokemon:
@@ -563,12 +541,10 @@ class PokemonGame(Menus):
             image = self.image_path.format('shiny', pokemon, 0)
         elif isinstance(pokemon, str):
             query_type = 'fuzzy'
-            pokemon_names = [p.base_name for p in await get_all_pokemon(ctx)]
-            result = list(process.extractOne(pokemon, pokemon_names))
-            if result[1] < 70:
+            try:
+                info = await Pokemon.from_name(ctx, pokemon)
+            except errors.PokemonNotFound:
                 return await ctx.send(f'Pokemon {pokemon} does not exist.')
-            pokemon_number = await Pokemon.from_name(ctx, result[0])
-            info = await Pokemon.from_num(ctx, pokemon_number.num)
             image = self.image_path.format('shiny', info.num, 0)
         else:
             query_type = None
@@ -649,8 +625,6 @@ class PokemonGame(Menus):
         reacted = None
 
         def accept_check(reaction, reaction_user):
-            if reaction.message.id != accept_msg.id or reaction.emoji not in (DONE, CANCEL):
-                return False
             if reaction.emoji == DONE:
                 nonlocal accept_reaction
                 accept_reaction = reaction
@@ -661,16 +635,17 @@ class PokemonGame(Menus):
                     return True
             return all(isinstance(value, bool) for value in accepted.values())
 
+        deadline = self.bot.loop.time() + 60
         try:
-            with aiohttp.Timeout(60):
-                while True:
-                    await self.bot.wait_for('reaction_add', check=accept_check)
-                    if accepted[author.id] and accepted[user.id]:
-                        reacted = await accept_reaction.users().flatten()
-                        if author in reacted and user in reacted:
-                            break
-                    elif any(not value for value in accepted.values()):
+            while True:
+                await self.bot.router.wait_for_reaction(accept_msg.id, emojis=(DONE, CANCEL), check=accept_check,
+                                                        timeout=deadline - self.bot.loop.time())
+                if accepted[author.id] and accepted[user.id]:
+                    reacted = await accept_reaction.users().flatten()
+                    if author in reacted and user in reacted:
                         break
+                elif any(not value for value in accepted.values()):
+                    break
         except asyncio.TimeoutError:
             pass
 
@@ -686,15 +661,12 @@ class PokemonGame(Menus):
                 await ctx.send(f'**{u.name}** declined the trade.', delete_after=60)
                 await accept_msg.delete()
                 return
-        for selection, old, new in zip(selected, (author, user), (user, author)):
-            new_trainer = await Trainer.from_user_id(ctx, new.id)
-            await new_trainer.see(selection)
-            for mon in selection:
-                evolved = await mon.check_evolve(trade_for=selected[not selected.index(selection)], trading=True)
-                if evolved:
-                    await mon.evolve(evolved)
-
-                await mon.transfer_ownership(new_trainer)
+        try:
+            await settle_trade(ctx, {author.id: (user.id, selected[0]), user.id: (author.id, selected[1])})
+        except errors.TradeError as e:
+            await accept_msg.delete()
+            await ctx.send(f'The trade was cancelled. {e}', delete_after=60)
+            return
 
         offers = [[mon.id for mon in s] for s in selected]
         await accept_msg.delete()
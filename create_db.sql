@@ -56,6 +56,8 @@ CREATE TABLE pokemon (
     speed_yield smallint
 );
 
+CREATE UNIQUE INDEX pokemon_num_form_id_idx ON pokemon (num, form_id);
+
 CREATE TABLE items (
     id smallserial,
     name text PRIMARY KEY,
@@ -80,14 +82,82 @@ CREATE TABLE evolutions (
 );
 
 CREATE TABLE statistics (
-    id bigserial PRIMARY KEY,
+    id bigserial,
     event_name text,
     user_id bigint,
     message_id bigint,
     channel_id bigint,
     guild_id bigint,
     information json DEFAULT '{}',
-    timestamp timestamp DEFAULT NOW()
+    timestamp timestamp NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE INDEX statistics_event_name_timestamp_idx ON statistics (event_name, timestamp);
+CREATE INDEX statistics_user_id_timestamp_idx ON statistics (user_id, timestamp);
+
+-- statistics is partitioned by month, partitions are named statistics_YYYY_MM
+-- timestamps are UTC, see utils.events.EventSink
+CREATE OR REPLACE FUNCTION create_statistics_partitions(months_ahead integer, since timestamp DEFAULT NULL)
+RETURNS void AS $$
+DECLARE
+    month timestamp := date_trunc('month', COALESCE(since, NOW() AT TIME ZONE 'UTC'));
+BEGIN
+    WHILE month <= date_trunc('month', NOW() AT TIME ZONE 'UTC') + months_ahead * interval '1 month' LOOP
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF statistics FOR VALUES FROM (%L) TO (%L)',
+                       'statistics_' || to_char(month, 'YYYY_MM'), month, month + interval '1 month');
+        month := month + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- drops every partition that only holds rows older than the retention
+CREATE OR REPLACE FUNCTION drop_statistics_partitions(retention interval) RETURNS SETOF text AS $$
+DECLARE
+    partition_name text;
+BEGIN
+    FOR partition_name IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'statistics'::regclass AND c.relname ~ '^statistics_\d{4}_\d{2}$'
+        AND to_timestamp(substr(c.relname, 12), 'YYYY_MM')::timestamp + interval '1 month'
+            <= NOW() AT TIME ZONE 'UTC' - retention
+        ORDER BY c.relname
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition_name);
+        RETURN NEXT partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_statistics_partitions(2);
+
+-- counts of statistics rows, incremented with each batch written by utils.events.EventSink
+-- facet '' counts every row, other facets are values of the key in utils.events.FACETS
+-- guild_id 0 counts DMs
+CREATE TABLE statistics_hourly (
+    event_name text,
+    facet text,
+    guild_id bigint,
+    hour timestamp,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_name, facet, guild_id, hour)
+);
+
+CREATE TABLE statistics_daily (
+    event_name text,
+    facet text,
+    guild_id bigint,
+    day date,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_name, facet, guild_id, day)
+);
+
+CREATE TABLE statistics_totals (
+    event_name text,
+    facet text,
+    guild_id bigint,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_name, facet, guild_id)
 );
 
 CREATE TABLE moves (
@@ -103,9 +173,20 @@ CREATE TABLE moves (
 CREATE TABLE trainers (
     user_id bigint PRIMARY KEY,
     secret_id integer DEFAULT rand(65535)::integer,
-    inventory json DEFAULT '{"money": 1500, "Pokeball": 40, "Greatball": 10, "Ultraball": 5, "Masterball": 1}'
+    inventory jsonb DEFAULT '{"money": 1500, "Pokeball": 40, "Greatball": 10, "Ultraball": 5, "Masterball": 1}'
 );
 
+-- adds the counts in deltas to an inventory, returning NULL if any count would be negative
+CREATE OR REPLACE FUNCTION inventory_add(inventory jsonb, deltas jsonb) RETURNS jsonb AS $$
+    SELECT CASE WHEN bool_and(count >= 0) IS FALSE THEN NULL
+                ELSE COALESCE(jsonb_object_agg(key, count) FILTER (WHERE count > 0), '{}') END
+    FROM (
+        SELECT key, SUM(value::text::bigint) AS count
+        FROM (SELECT * FROM jsonb_each(inventory) UNION ALL SELECT * FROM jsonb_each(deltas)) entries
+        GROUP BY key
+    ) counts;
+$$ LANGUAGE sql IMMUTABLE;
+
 CREATE TABLE seen (
     user_id bigint REFERENCES trainers(user_id),
     num smallint REFERENCES pokenum(num),
@@ -136,13 +217,61 @@ CREATE TABLE found (
     defense_ev smallint DEFAULT 0,
     sp_attack_ev smallint DEFAULT 0,
     sp_defense_ev smallint DEFAULT 0,
-    speed_ev smallint DEFAULT 0
+    speed_ev smallint DEFAULT 0,
+    shiny boolean NOT NULL DEFAULT FALSE,
+    nature_mod smallint GENERATED ALWAYS AS ((personality % 25)::smallint) STORED,
+    level smallint GENERATED ALWAYS AS (GREATEST(floor(power(((exp + 1) * 2)::float8, 1::float8 / 3)), 1)::smallint) STORED
 );
 
+CREATE INDEX found_owner_idx ON found (owner, party_position, num, form_id, id);
+CREATE INDEX found_owner_shiny_idx ON found (owner) WHERE shiny;
+-- the groups that the PC is paged through, in order
+CREATE INDEX found_owner_pc_groups_idx ON found (owner, COALESCE(party_position, 32767), num, form_id, shiny,
+                                                 COALESCE(name, ''));
+
+-- shiny depends on the original owner's secret_id, so it is set when written
+CREATE OR REPLACE FUNCTION found_set_shiny() RETURNS trigger AS $$
+BEGIN
+    SELECT (((NEW.original_owner % 65536) # secret_id) # ((NEW.personality >> 16) # (NEW.personality & 65535))) <= 163
+    INTO NEW.shiny FROM trainers WHERE user_id = NEW.original_owner;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER found_set_shiny BEFORE INSERT OR UPDATE OF personality, original_owner ON found
+    FOR EACH ROW EXECUTE PROCEDURE found_set_shiny();
+
 -- no more pokemon stuff
 
 CREATE TABLE plonks (
     guild_id bigint,
     user_id bigint,
     PRIMARY KEY (guild_id, user_id)
-);
\ No newline at end of file
+);
+
+-- other bot processes keep their plonks in sync by listening on this channel
+CREATE OR REPLACE FUNCTION plonks_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM pg_notify('plonks', json_build_object('op', 'DELETE', 'guild_id', OLD.guild_id, 'user_id', OLD.user_id)::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('plonks', json_build_object('op', 'INSERT', 'guild_id', NEW.guild_id, 'user_id', NEW.user_id)::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER plonks_notify AFTER INSERT OR UPDATE OR DELETE ON plonks
+    FOR EACH ROW EXECUTE PROCEDURE plonks_notify();
+
+-- other bot processes keep their cached inventories in sync by listening on this channel
+CREATE OR REPLACE FUNCTION trainers_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('trainers', json_build_object('user_id', NEW.user_id, 'inventory', NEW.inventory)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trainers_notify AFTER UPDATE OF inventory ON trainers
+    FOR EACH ROW WHEN (OLD.inventory IS DISTINCT FROM NEW.inventory) EXECUTE PROCEDURE trainers_notify();
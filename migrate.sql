@@ -0,0 +1,203 @@
+-- Upgrades a database created from an older create_db.sql.
+-- Every statement can be run again safely.
+
+CREATE UNIQUE INDEX IF NOT EXISTS pokemon_num_form_id_idx ON pokemon (num, form_id);
+CREATE INDEX IF NOT EXISTS found_owner_idx ON found (owner, party_position, num, form_id, id);
+
+ALTER TABLE found ADD COLUMN IF NOT EXISTS shiny boolean NOT NULL DEFAULT FALSE;
+ALTER TABLE found ADD COLUMN IF NOT EXISTS nature_mod smallint GENERATED ALWAYS AS ((personality % 25)::smallint) STORED;
+ALTER TABLE found ADD COLUMN IF NOT EXISTS level smallint
+    GENERATED ALWAYS AS (GREATEST(floor(power(((exp + 1) * 2)::float8, 1::float8 / 3)), 1)::smallint) STORED;
+CREATE INDEX IF NOT EXISTS found_owner_shiny_idx ON found (owner) WHERE shiny;
+
+CREATE OR REPLACE FUNCTION found_set_shiny() RETURNS trigger AS $$
+BEGIN
+    SELECT (((NEW.original_owner % 65536) # secret_id) # ((NEW.personality >> 16) # (NEW.personality & 65535))) <= 163
+    INTO NEW.shiny FROM trainers WHERE user_id = NEW.original_owner;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS found_set_shiny ON found;
+CREATE TRIGGER found_set_shiny BEFORE INSERT OR UPDATE OF personality, original_owner ON found
+    FOR EACH ROW EXECUTE PROCEDURE found_set_shiny();
+UPDATE found SET personality = personality;
+
+-- other bot processes keep their plonks in sync by listening on this channel
+CREATE OR REPLACE FUNCTION plonks_notify() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM pg_notify('plonks', json_build_object('op', 'DELETE', 'guild_id', OLD.guild_id, 'user_id', OLD.user_id)::text);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('plonks', json_build_object('op', 'INSERT', 'guild_id', NEW.guild_id, 'user_id', NEW.user_id)::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS plonks_notify ON plonks;
+CREATE TRIGGER plonks_notify AFTER INSERT OR UPDATE OR DELETE ON plonks
+    FOR EACH ROW EXECUTE PROCEDURE plonks_notify();
+
+-- counts of statistics rows, incremented with each batch written by utils.events.EventSink
+-- facet '' counts every row, other facets are values of the key in utils.events.FACETS
+-- guild_id 0 counts DMs
+CREATE TABLE IF NOT EXISTS statistics_hourly (
+    event_name text,
+    facet text,
+    guild_id bigint,
+    hour timestamp,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_name, facet, guild_id, hour)
+);
+
+CREATE TABLE IF NOT EXISTS statistics_daily (
+    event_name text,
+    facet text,
+    guild_id bigint,
+    day date,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_name, facet, guild_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS statistics_totals (
+    event_name text,
+    facet text,
+    guild_id bigint,
+    count bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (event_name, facet, guild_id)
+);
+
+-- the rollup keys of a statistics row, matching utils.events.rollup_keys
+CREATE OR REPLACE FUNCTION statistics_facets(event_name text, information json) RETURNS SETOF text AS $$
+    SELECT facet FROM (VALUES (''), (information->>(CASE event_name
+        WHEN 'pc_accessed' THEN 'query_type'
+        WHEN 'pokedex_accessed' THEN 'query_type'
+        WHEN 'pokemon_encountered' THEN 'shiny'
+        WHEN 'pokemon_caught' THEN 'ball'
+        WHEN 'pokemon_fled' THEN 'shiny'
+        WHEN 'item_used' THEN 'item'
+        WHEN 'reward_collected' THEN 'item'
+    END))) facets (facet) WHERE facet IS NOT NULL;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- existing buckets are never counted twice, since DO NOTHING skips them
+INSERT INTO statistics_hourly (event_name, facet, guild_id, hour, count)
+SELECT event_name, facet, COALESCE(guild_id, 0), date_trunc('hour', timestamp), COUNT(*)
+FROM statistics, statistics_facets(event_name, information) facet
+GROUP BY 1, 2, 3, 4
+ON CONFLICT DO NOTHING;
+INSERT INTO statistics_daily (event_name, facet, guild_id, day, count)
+SELECT event_name, facet, COALESCE(guild_id, 0), timestamp::date, COUNT(*)
+FROM statistics, statistics_facets(event_name, information) facet
+GROUP BY 1, 2, 3, 4
+ON CONFLICT DO NOTHING;
+INSERT INTO statistics_totals (event_name, facet, guild_id, count)
+SELECT event_name, facet, COALESCE(guild_id, 0), COUNT(*)
+FROM statistics, statistics_facets(event_name, information) facet
+GROUP BY 1, 2, 3
+ON CONFLICT DO NOTHING;
+
+-- statistics is partitioned by month, partitions are named statistics_YYYY_MM
+-- timestamps are UTC, see utils.events.EventSink
+CREATE OR REPLACE FUNCTION create_statistics_partitions(months_ahead integer, since timestamp DEFAULT NULL)
+RETURNS void AS $$
+DECLARE
+    month timestamp := date_trunc('month', COALESCE(since, NOW() AT TIME ZONE 'UTC'));
+BEGIN
+    WHILE month <= date_trunc('month', NOW() AT TIME ZONE 'UTC') + months_ahead * interval '1 month' LOOP
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF statistics FOR VALUES FROM (%L) TO (%L)',
+                       'statistics_' || to_char(month, 'YYYY_MM'), month, month + interval '1 month');
+        month := month + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- drops every partition that only holds rows older than the retention
+CREATE OR REPLACE FUNCTION drop_statistics_partitions(retention interval) RETURNS SETOF text AS $$
+DECLARE
+    partition_name text;
+BEGIN
+    FOR partition_name IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'statistics'::regclass AND c.relname ~ '^statistics_\d{4}_\d{2}$'
+        AND to_timestamp(substr(c.relname, 12), 'YYYY_MM')::timestamp + interval '1 month'
+            <= NOW() AT TIME ZONE 'UTC' - retention
+        ORDER BY c.relname
+    LOOP
+        EXECUTE format('DROP TABLE %I', partition_name);
+        RETURN NEXT partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- statistics can't be partitioned in place, so an unpartitioned table is copied into a new one
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT FROM pg_partitioned_table WHERE partrelid = 'statistics'::regclass) THEN
+        ALTER TABLE statistics RENAME TO statistics_unpartitioned;
+        ALTER TABLE statistics_unpartitioned RENAME CONSTRAINT statistics_pkey TO statistics_unpartitioned_pkey;
+        CREATE TABLE statistics (
+            id bigint NOT NULL DEFAULT nextval('statistics_id_seq'),
+            event_name text,
+            user_id bigint,
+            message_id bigint,
+            channel_id bigint,
+            guild_id bigint,
+            information json DEFAULT '{}',
+            timestamp timestamp NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp);
+        ALTER SEQUENCE statistics_id_seq OWNED BY statistics.id;
+        PERFORM create_statistics_partitions(2, (SELECT MIN(timestamp) FROM statistics_unpartitioned));
+        INSERT INTO statistics
+        SELECT id, event_name, user_id, message_id, channel_id, guild_id, information, COALESCE(timestamp, NOW())
+        FROM statistics_unpartitioned;
+        DROP TABLE statistics_unpartitioned;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS statistics_event_name_timestamp_idx ON statistics (event_name, timestamp);
+CREATE INDEX IF NOT EXISTS statistics_user_id_timestamp_idx ON statistics (user_id, timestamp);
+SELECT create_statistics_partitions(2);
+
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'trainers' AND column_name = 'inventory') = 'json' THEN
+        ALTER TABLE trainers ALTER COLUMN inventory DROP DEFAULT;
+        ALTER TABLE trainers ALTER COLUMN inventory TYPE jsonb USING inventory::jsonb;
+        ALTER TABLE trainers ALTER COLUMN inventory
+            SET DEFAULT '{"money": 1500, "Pokeball": 40, "Greatball": 10, "Ultraball": 5, "Masterball": 1}';
+    END IF;
+END;
+$$;
+
+-- adds the counts in deltas to an inventory, returning NULL if any count would be negative
+CREATE OR REPLACE FUNCTION inventory_add(inventory jsonb, deltas jsonb) RETURNS jsonb AS $$
+    SELECT CASE WHEN bool_and(count >= 0) IS FALSE THEN NULL
+                ELSE COALESCE(jsonb_object_agg(key, count) FILTER (WHERE count > 0), '{}') END
+    FROM (
+        SELECT key, SUM(value::text::bigint) AS count
+        FROM (SELECT * FROM jsonb_each(inventory) UNION ALL SELECT * FROM jsonb_each(deltas)) entries
+        GROUP BY key
+    ) counts;
+$$ LANGUAGE sql IMMUTABLE;
+
+DROP INDEX IF EXISTS found_owner_pc_idx;
+CREATE INDEX IF NOT EXISTS found_owner_pc_groups_idx ON found (owner, COALESCE(party_position, 32767), num, form_id, shiny,
+                                                               COALESCE(name, ''));
+
+-- other bot processes keep their cached inventories in sync by listening on this channel
+CREATE OR REPLACE FUNCTION trainers_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('trainers', json_build_object('user_id', NEW.user_id, 'inventory', NEW.inventory)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trainers_notify ON trainers;
+CREATE TRIGGER trainers_notify AFTER UPDATE OF inventory ON trainers
+    FOR EACH ROW WHEN (OLD.inventory IS DISTINCT FROM NEW.inventory) EXECUTE PROCEDURE trainers_notify();
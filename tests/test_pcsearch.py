@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip('discord')
+
+from utils.pcsearch import is_search  # noqa: E402
+
+
+@pytest.mark.parametrize('query', ['shiny', '!shiny', '! shiny', 'not party', 'type:fire', 'level:10-20',
+                                   'attack>120', 'shiny and legendary'])
+def test_searches(query):
+    assert is_search(query)
+
+
+@pytest.mark.parametrize('query', ['pikachu', 'Mr. Mime', 'Rotom (Wash)', 'Farfetch\'d'])
+def test_names(query):
+    assert not is_search(query)
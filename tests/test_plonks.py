@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from utils import listener
+from utils.plonks import PlonkCache
+
+
+class FakeConnection:
+    """Fires the given notifications while the plonks table is being loaded."""
+    def __init__(self, records, during_fetch=()):
+        self.records = records
+        self.during_fetch = during_fetch
+        self.listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(callback)
+
+    async def fetch(self, query):
+        for change in self.during_fetch:
+            for callback in self.listeners:
+                callback(self, 1, PlonkCache.channel, json.dumps(change))
+        return self.records
+
+    def add_termination_listener(self, callback):
+        pass
+
+    def remove_termination_listener(self, callback):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def start(monkeypatch, con):
+    async def connect(dsn):
+        return con
+
+    monkeypatch.setattr(listener.asyncpg, 'connect', connect)
+    cache = PlonkCache('postgres://')
+    asyncio.run(cache.start())
+    return cache
+
+
+def test_notifications_while_loading_are_replayed(monkeypatch):
+    # The plonk of 2 was committed after the snapshot and the unplonk of 1 before it.
+    con = FakeConnection([{'guild_id': 10, 'user_id': 1}],
+                         during_fetch=[{'op': 'DELETE', 'guild_id': 10, 'user_id': 1},
+                                       {'op': 'INSERT', 'guild_id': 10, 'user_id': 2}])
+    cache = start(monkeypatch, con)
+    assert not cache.is_plonked(10, 1)
+    assert cache.is_plonked(10, 2)
+    assert len(cache) == 1
+
+
+def test_notifications_after_loading_are_applied(monkeypatch):
+    con = FakeConnection([{'guild_id': 10, 'user_id': 1}])
+    cache = start(monkeypatch, con)
+    con.listeners[0](con, 1, PlonkCache.channel, json.dumps({'op': 'INSERT', 'guild_id': 20, 'user_id': 3}))
+    con.listeners[0](con, 1, PlonkCache.channel, json.dumps({'op': 'DELETE', 'guild_id': 10, 'user_id': 1}))
+    assert cache.is_plonked(20, 3)
+    assert not cache.is_plonked(10, 1)
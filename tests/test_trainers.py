@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from utils import listener
+from utils.trainers import TrainerCache
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = []
+        self.termination_listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(callback)
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def remove_termination_listener(self, callback):
+        self.termination_listeners.remove(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def notify(self, user_id, inventory):
+        payload = json.dumps({'user_id': user_id, 'inventory': inventory})
+        for callback in self.listeners:
+            callback(self, 1, TrainerCache.channel, payload)
+
+
+class FakeStatements:
+    async def fetchrow(self, con, name, user_id):
+        return {'user_id': user_id, 'secret_id': 7, 'inventory': {'money': 100, 'Pokeball': 5}}
+
+
+def start(monkeypatch, connections):
+    async def connect(dsn):
+        con = FakeConnection()
+        connections.append(con)
+        return con
+
+    monkeypatch.setattr(listener.asyncpg, 'connect', connect)
+    cache = TrainerCache(FakeStatements(), 'postgres://')
+    return cache
+
+
+def test_inventory_changed_elsewhere_is_applied(monkeypatch):
+    connections = []
+
+    async def run():
+        cache = start(monkeypatch, connections)
+        await cache.start()
+        await cache.get(None, 1)
+        connections[0].notify(1, {'money': 40})
+        connections[0].notify(2, {'money': 10})
+        row = await cache.get(None, 1)
+        assert row['inventory'] == {'money': 40}
+        assert 2 not in cache
+        assert cache.misses == 1
+
+    asyncio.run(run())
+
+
+def test_reconnect_evicts_every_trainer(monkeypatch):
+    connections = []
+
+    async def run():
+        cache = start(monkeypatch, connections)
+        await cache.start()
+        await cache.get(None, 1)
+        con = connections[0]
+        con.closed = True
+        for callback in list(con.termination_listeners):
+            callback(con)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(connections) == 2
+        assert 1 not in cache
+        await cache.close()
+        assert connections[1].closed
+
+    asyncio.run(run())
@@ -0,0 +1,201 @@
+from collections import namedtuple, Counter
+from types import MappingProxyType
+
+from utils.menus import STAR, GLOWING_STAR
+from utils.evolution import EvolutionGraph
+from utils.errors import PokemonNotFound
+from utils.search import NameIndex
+
+
+def _freeze(rec, **extra):
+    """Returns an immutable mapping for a DB record.
+
+    Arrays are converted to tuples so the whole row is read-only.
+    """
+    data = {key: tuple(val) if isinstance(val, list) else val for key, val in rec.items()}
+    data.update(extra)
+    return MappingProxyType(data)
+
+
+class Species:
+    """An immutable row from the `pokemon` table.
+
+    Every :class:`utils.orm.Pokemon` of the same num and form_id
+    shares one :class:`Species` instead of copying its columns.
+
+    Attributes
+    ----------
+    colors: Tuple[int]
+        The colors of the :class:`Species`'s types.
+    color: int
+        The average of :attr:`colors`.
+    star: str
+        The unicode star for the :class:`Species`.
+    display_name: str
+        A nicely formatted display name.
+
+    Every column of the `pokemon` table is also an attribute.
+    """
+    COLUMNS = ('num', 'base_name', 'form', 'form_id', 'generation', 'type', 'legendary', 'mythical',
+               'base_hp', 'base_attack', 'base_defense', 'base_sp_attack', 'base_sp_defense', 'base_speed',
+               'xp_yield', 'hp_yield', 'attack_yield', 'defense_yield', 'sp_attack_yield', 'sp_defense_yield',
+               'speed_yield')
+    __slots__ = (*COLUMNS, 'colors', 'color', 'star', 'display_name')
+
+    def __init__(self, rec, colors):
+        set_ = super().__setattr__
+        for key in self.COLUMNS:
+            value = rec[key]
+            set_(key, tuple(value) if isinstance(value, list) else value)
+        set_('colors', tuple(colors))
+        set_('color', round(sum(colors) / len(colors)))
+        set_('star', GLOWING_STAR if self.mythical else STAR if self.legendary else '')
+        set_('display_name', f'{self.form} {self.base_name}' if self.form else self.base_name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __repr__(self):
+        return f'<Species num={self.num} form_id={self.form_id} name={self.base_name}>'
+
+
+CatalogSummary = namedtuple('CatalogSummary', 'total generations legendary mythical names')
+CatalogSummary.__doc__ = """Totals for the species in the :class:`Catalog`.
+
+Forms are not counted separately, so each num is one species.
+
+Attributes
+----------
+total: int
+    The amount of species.
+generations: Mapping[int, int]
+    The amount of species per generation.
+legendary: int
+    The amount of legendary species that are not mythical.
+mythical: int
+    The amount of mythical species.
+names: Tuple[str]
+    The base name of every species, ordered by num.
+"""
+
+
+class Catalog:
+    """An in-memory copy of the reference tables from `populate.sql`.
+
+    These tables never change while the bot is running, so they are
+    loaded once at startup and every lookup is served from memory.
+
+    Attributes
+    ----------
+    types: Mapping[str, Mapping]
+        The rows of the `types` table, keyed by name.
+    natures: Tuple[Mapping]
+        The rows of the `natures` table, indexed by mod.
+    pokemon: Tuple[:class:`Species`]
+        The rows of the `pokemon` table ordered by num and form_id.
+    items: Tuple[Mapping]
+        The rows of the `items` table ordered by ID.
+    rewards: Tuple[Mapping]
+        The rows of the `rewards` table.
+    evolutions: Tuple[Mapping]
+        The rows of the `evolutions` table ordered by ID.
+    evolution_graph: :class:`EvolutionGraph`
+        The `evolutions` table compiled into a graph.
+    moves: Mapping[int, Mapping]
+        The rows of the `moves` table, keyed by ID.
+    summary: :class:`CatalogSummary`
+        Totals for the species in the `pokemon` table.
+    names: :class:`NameIndex`
+        A fuzzy search index from names to :class:`Species`.
+        Forms can be searched as `Attack Deoxys` or `Deoxys Attack`.
+    """
+    def __init__(self, *, types, natures, pokemon, items, rewards, evolutions, moves):
+        self.types = MappingProxyType({t['name']: _freeze(t) for t in types})
+        self.natures = tuple(_freeze(n) for n in sorted(natures, key=lambda n: n['mod']))
+        self.pokemon = tuple(Species(p, [self.types[t]['color'] for t in p['type']])
+                             for p in sorted(pokemon, key=lambda p: (p['num'], p['form_id'])))
+        self.items = tuple(_freeze(i) for i in sorted(items, key=lambda i: i['id']))
+        self.rewards = tuple(_freeze(r) for r in rewards)
+        self.evolutions = tuple(_freeze(e) for e in sorted(evolutions, key=lambda e: e['id']))
+        self.moves = MappingProxyType({m['id']: _freeze(m) for m in moves})
+
+        self._pokemon = {(p.num, p.form_id): p for p in self.pokemon}
+        self._items = {i['name']: i for i in self.items}
+        self.evolution_graph = EvolutionGraph(self)
+
+        species = [p for p in self.pokemon if p.form_id == 0]
+        self.summary = CatalogSummary(
+            total=len(species),
+            generations=MappingProxyType(Counter(p.generation for p in species)),
+            legendary=sum(1 for p in species if p.legendary and not p.mythical),
+            mythical=sum(1 for p in species if p.mythical),
+            names=tuple(p.base_name for p in species))
+
+        aliases = [(p.base_name, p) for p in self.pokemon]
+        for p in self.pokemon:
+            if p.form:
+                aliases.extend(((f'{p.form} {p.base_name}', p), (f'{p.base_name} {p.form}', p)))
+        self.names = NameIndex(aliases)
+
+    @classmethod
+    async def load(cls, pool):
+        """Loads the :class:`Catalog` from the DB.
+
+        Parameters
+        ----------
+        pool: asyncpg.pool.Pool
+            The pool to acquire a connection from.
+
+        Returns
+        -------
+        :class:`Catalog`:
+            The loaded :class:`Catalog`.
+        """
+        async with pool.acquire() as con:
+            return cls(types=await con.fetch('SELECT * FROM types'),
+                       natures=await con.fetch('SELECT * FROM natures'),
+                       pokemon=await con.fetch('SELECT * FROM pokemon'),
+                       items=await con.fetch('SELECT * FROM items'),
+                       rewards=await con.fetch('SELECT * FROM rewards'),
+                       evolutions=await con.fetch('SELECT * FROM evolutions'),
+                       moves=await con.fetch('SELECT * FROM moves'))
+
+    def get_pokemon(self, num: int, form_id=0):
+        """Returns the :class:`Species` for a num and form_id.
+
+        Parameters
+        ----------
+        num: int
+            The num of the Pokemon.
+        Optional[form_id: int]
+            The form_id of the Pokemon.
+
+        Returns
+        -------
+        :class:`Species`:
+            The `pokemon` row.
+
+        Raises
+        ------
+        PokemonNotFound
+            No Pokemon exists with the num and form_id.
+        """
+        try:
+            return self._pokemon[num, form_id]
+        except KeyError:
+            raise PokemonNotFound(f'Pokemon not found with num: {num}, form_id: {form_id}') from None
+
+    def get_nature(self, mod: int):
+        """Returns the `natures` row for a mod, which is the personality modulo 25."""
+        return self.natures[mod % len(self.natures)]
+
+    def get_item(self, name: str):
+        """Returns the `items` row for a name, or `None` if it does not exist."""
+        return self._items.get(name)
+
+    def get_move(self, move_id: int):
+        """Returns the `moves` row for an ID, or `None` if it does not exist."""
+        return self.moves.get(move_id)
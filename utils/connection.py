@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+
+class PoolStats:
+    """Timings of connections acquired through :class:`LazyConnection`.
+
+    Attributes
+    ----------
+    acquired: int
+        The amount of connections acquired.
+    waiting: int
+        The amount of :class:`LazyConnection` currently waiting on the pool.
+    held: int
+        The amount of connections currently held.
+    total_wait: float
+        The total seconds spent waiting on the pool.
+    max_wait: float
+        The longest wait on the pool in seconds.
+    total_hold: float
+        The total seconds that released connections were held.
+    max_hold: float
+        The longest that a released connection was held in seconds.
+    """
+    def __init__(self):
+        self.acquired = 0
+        self.waiting = 0
+        self.held = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_hold = 0.0
+        self.max_hold = 0.0
+
+    @property
+    def average_wait(self):
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    @property
+    def average_hold(self):
+        released = self.acquired - self.held
+        return self.total_hold / released if released else 0.0
+
+    def record_wait(self, seconds: float):
+        self.acquired += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def record_hold(self, seconds: float):
+        self.total_hold += seconds
+        self.max_hold = max(self.max_hold, seconds)
+
+
+class _LazyTransaction:
+    def __init__(self, lazy, kwargs):
+        self.lazy = lazy
+        self.kwargs = kwargs
+        self.transaction = None
+
+    async def __aenter__(self):
+        con = await self.lazy.acquire()
+        self.transaction = con.transaction(**self.kwargs)
+        return await self.transaction.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        return await self.transaction.__aexit__(*exc_info)
+
+
+class LazyConnection:
+    """A connection handle that only acquires from the pool when first used.
+
+    Most messages never touch the DB, so a connection is acquired the
+    first time a query is run and given back by :meth:`release`, which is
+    safe to call whether or not anything was acquired. Using the handle
+    again after :meth:`release` acquires a new connection.
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The pool to acquire from.
+    stats: :class:`PoolStats`
+        The stats to record pool timings in.
+    """
+    def __init__(self, pool, stats):
+        self.pool = pool
+        self.stats = stats
+        self._con = None
+        self._acquired_at = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def acquired(self):
+        return self._con is not None
+
+    async def acquire(self):
+        """Returns the underlying pooled connection, acquiring it if needed."""
+        if self._con is not None:
+            return self._con
+        async with self._lock:
+            if self._con is None:
+                self.stats.waiting += 1
+                start = time.perf_counter()
+                try:
+                    self._con = await self.pool.acquire()
+                finally:
+                    self.stats.waiting -= 1
+                self._acquired_at = time.perf_counter()
+                self.stats.record_wait(self._acquired_at - start)
+                self.stats.held += 1
+        return self._con
+
+    async def release(self):
+        """Releases the connection back to the pool if one was acquired."""
+        if self._con is None:
+            return
+        con, self._con = self._con, None
+        self.stats.held -= 1
+        self.stats.record_hold(time.perf_counter() - self._acquired_at)
+        await self.pool.release(con)
+
+    def transaction(self, **kwargs):
+        """Returns an async context manager for a transaction, acquiring first."""
+        return _LazyTransaction(self, kwargs)
+
+    async def fetch(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).fetchval(query, *args, **kwargs)
+
+    async def execute(self, query: str, *args, **kwargs):
+        return await (await self.acquire()).execute(query, *args, **kwargs)
+
+    async def executemany(self, command: str, args, **kwargs):
+        return await (await self.acquire()).executemany(command, args, **kwargs)
+
+    async def prepare(self, query: str, **kwargs):
+        return await (await self.acquire()).prepare(query, **kwargs)
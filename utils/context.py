@@ -1,10 +1,12 @@
 from discord.ext import commands
 
+from utils.events import count_events
+
 # Note: stdlib.typing would be used for these, but it breaks isinstance checks.
 EVENTS = {
     'pc_accessed': {
         'query': (str, int),  #           str | int
-        'query_type': str  # fuzzy, statistic | num, member
+        'query_type': str  # fuzzy, search | num, member
     },
     'pokedex_accessed': {
         'query': (str, int),  #            str | int
@@ -87,18 +89,24 @@ class Context(commands.Context):
         else:
             guild_id = None
 
-        await self.con.execute("""
-            INSERT INTO statistics (event_name, user_id, message_id, channel_id, guild_id, information)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            """, event, author_id, message_id, channel_id, guild_id, to_insert)
         self.bot.dispatch(event, **to_insert)
+        await self.bot.events.put(event, author_id, message_id, channel_id, guild_id, to_insert)
 
-    async def get_event_count(self, *events):
-        if events:
-            return await self.con.fetchval("""
-                SELECT COUNT(*) FROM statistics WHERE event_name = ANY($1)
-                """, events)
-        else:
-            return await self.con.fetchval("""
-                SELECT COUNT(*) FROM statistics
-                """)
+    async def get_event_count(self, *events, guild_id=None, since=None, until=None):
+        """Returns the amount of times events were logged.
+
+        Read from the rollup tables, see :func:`utils.events.count_events`.
+        Every event is counted if none are given.
+        """
+        counts = await count_events(self.con, events, facets=[''], guild_id=guild_id, since=since, until=until)
+        return counts['']
+
+    async def get_event_breakdown(self, event, guild_id=None, since=None, until=None):
+        """Returns the amount of times an event was logged per value of its facet.
+
+        The facet of each event is in :data:`utils.events.FACETS`, so for
+        example the flee rate of shiny Pokemon is the `'true'` count of
+        `pokemon_fled` over the `'true'` count of `pokemon_encountered`.
+        Read from the rollup tables, see :func:`utils.events.count_events`.
+        """
+        return await count_events(self.con, [event], guild_id=guild_id, since=since, until=until)
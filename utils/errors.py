@@ -9,3 +9,13 @@ class PokemonNotFound(Exception):
 class WrongChannel(commands.CheckFailure):
     def __init__(self, channel=None):
         self.channel = channel
+
+
+class InvalidQuery(Exception):
+    """The PC search query could not be parsed."""
+    pass
+
+
+class TradeError(Exception):
+    """The trade could not be settled, so nothing was changed."""
+    pass
@@ -0,0 +1,325 @@
+from collections import Counter
+import traceback
+import datetime
+import asyncio
+import json
+import csv
+import io
+
+COLUMNS = ('event_name', 'user_id', 'message_id', 'channel_id', 'guild_id', 'information', 'timestamp')
+
+# The information key that each event is also counted by in the rollups
+FACETS = {
+    'pc_accessed': 'query_type',
+    'pokedex_accessed': 'query_type',
+    'pokemon_encountered': 'shiny',
+    'pokemon_caught': 'ball',
+    'pokemon_fled': 'shiny',
+    'item_used': 'item',
+    'reward_collected': 'item'
+}
+
+# Upserts that add a batch's counts to each rollup table
+ROLLUPS = {
+    'statistics_hourly': """
+        INSERT INTO statistics_hourly (event_name, facet, guild_id, hour, count)
+        SELECT * FROM unnest($1::text[], $2::text[], $3::bigint[], $4::timestamp[], $5::bigint[])
+        ON CONFLICT (event_name, facet, guild_id, hour) DO UPDATE SET count = statistics_hourly.count + EXCLUDED.count
+        """,
+    'statistics_daily': """
+        INSERT INTO statistics_daily (event_name, facet, guild_id, day, count)
+        SELECT * FROM unnest($1::text[], $2::text[], $3::bigint[], $4::date[], $5::bigint[])
+        ON CONFLICT (event_name, facet, guild_id, day) DO UPDATE SET count = statistics_daily.count + EXCLUDED.count
+        """,
+    'statistics_totals': """
+        INSERT INTO statistics_totals (event_name, facet, guild_id, count)
+        SELECT * FROM unnest($1::text[], $2::text[], $3::bigint[], $4::bigint[])
+        ON CONFLICT (event_name, facet, guild_id) DO UPDATE SET count = statistics_totals.count + EXCLUDED.count
+        """
+}
+
+
+def facet_value(value):
+    """Returns the text a facet value is stored as, matching `information->>key`."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def rollup_keys(event: str, guild_id, information: dict):
+    """Returns the (event_name, facet, guild_id) keys that an event is counted under.
+
+    Every event is counted under the facet `''`, and faceted events
+    are also counted under their value from :data:`FACETS`.
+    DMs are counted under the guild ID `0`.
+    """
+    guild_id = guild_id or 0
+    keys = [(event, '', guild_id)]
+    try:
+        keys.append((event, facet_value(information[FACETS[event]]), guild_id))
+    except KeyError:
+        pass
+    return keys
+
+
+class EventSink:
+    """Writes `statistics` rows in the background in batches.
+
+    Events are queued by :meth:`put` and written with a single `COPY`
+    once `batch_size` events are queued or `interval` seconds passed
+    since the first event of the batch. The queue holds at most
+    `max_size` events, and :meth:`put` waits for room when it is full.
+
+    The counts in the rollup tables from :data:`ROLLUPS` are
+    incremented in the same transaction as each batch.
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The pool to acquire a connection from for each batch.
+    Optional[max_size: int]
+        The maximum amount of queued events.
+    Optional[batch_size: int]
+        The maximum amount of events written at once.
+    Optional[interval: float]
+        The maximum seconds an event waits before being written.
+    Optional[retries: int]
+        The amount of times a failed batch is retried before it is dropped.
+
+    Attributes
+    ----------
+    written: int
+        The amount of events written.
+    dropped: int
+        The amount of events dropped after failing to write.
+    """
+    def __init__(self, pool, *, max_size=10000, batch_size=500, interval=5.0, retries=3):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retries = retries
+        self.written = 0
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=max_size)
+        self._task = None
+        self._closed = False
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def start(self, loop):
+        """Starts writing queued events on a loop."""
+        self._task = loop.create_task(self._run())
+
+    async def put(self, event: str, user_id: int, message_id: int, channel_id: int, guild_id, information: dict):
+        """Queues a `statistics` row, waiting if the queue is full.
+
+        Raises
+        ------
+        RuntimeError
+            The sink was closed.
+        """
+        if self._closed:
+            raise RuntimeError('EventSink is closed')
+        row = (event, user_id, message_id, channel_id, guild_id, information, datetime.datetime.utcnow())
+        await self._queue.put(row)
+
+    async def close(self):
+        """Writes every queued event and stops the sink."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            row = await self._queue.get()
+            if row is None:
+                return
+            batch = [row]
+            deadline = loop.time() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    await self._write(batch)
+                    return
+                batch.append(row)
+            await self._write(batch)
+
+    async def _write(self, batch):
+        # Unquoted empty fields are NULL in CSV, which is how a missing guild_id is written.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for event, user_id, message_id, channel_id, guild_id, information, timestamp in batch:
+            writer.writerow((event, user_id, message_id, channel_id, guild_id, json.dumps(information),
+                             timestamp.isoformat()))
+        data = buffer.getvalue().encode()
+
+        counts = {table: Counter() for table in ROLLUPS}
+        for event, _, _, _, guild_id, information, timestamp in batch:
+            hour = timestamp.replace(minute=0, second=0, microsecond=0)
+            for key in rollup_keys(event, guild_id, information):
+                counts['statistics_hourly'][(*key, hour)] += 1
+                counts['statistics_daily'][(*key, hour.date())] += 1
+                counts['statistics_totals'][key] += 1
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.pool.acquire() as con:
+                    async with con.transaction():
+                        await con.copy_to_table('statistics', source=io.BytesIO(data), columns=COLUMNS,
+                                                format='csv')
+                        for table, query in ROLLUPS.items():
+                            keys = counts[table]
+                            await con.execute(query, *map(list, zip(*keys)), list(keys.values()))
+            except Exception:
+                if attempt == self.retries:
+                    self.dropped += len(batch)
+                    print(f'Dropped {len(batch)} statistics after {attempt + 1} attempts')
+                    traceback.print_exc()
+                    return
+                await asyncio.sleep(2 ** attempt)
+            else:
+                self.written += len(batch)
+                return
+
+
+async def maintain_statistics(pool, *, retention=None, months_ahead=2):
+    """Creates upcoming `statistics` partitions and drops expired ones.
+
+    Parameters
+    ----------
+    pool: asyncpg.pool.Pool
+        The pool to acquire a connection from.
+    Optional[retention: datetime.timedelta]
+        How long rows are kept. Partitions are kept forever if `None`.
+        Whole monthly partitions are dropped, so rows are kept for up to
+        a month longer than this. The rollup tables are never dropped.
+    Optional[months_ahead: int]
+        The amount of months after the current one to create partitions for.
+
+    Returns
+    -------
+    List[str]:
+        The names of the dropped partitions.
+    """
+    async with pool.acquire() as con:
+        await con.execute('SELECT create_statistics_partitions($1)', months_ahead)
+        if retention is None:
+            return []
+        return [r[0] for r in await con.fetch('SELECT drop_statistics_partitions($1)', retention)]
+
+
+async def maintain_statistics_loop(pool, *, retention=None, months_ahead=2, interval=86400):
+    """Runs :func:`maintain_statistics` every `interval` seconds, forever."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            dropped = await maintain_statistics(pool, retention=retention, months_ahead=months_ahead)
+        except Exception:
+            traceback.print_exc()
+        else:
+            if dropped:
+                print(f'Dropped statistics partitions: {", ".join(dropped)}')
+
+
+def _floor_hour(time):
+    return time.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(time):
+    floored = _floor_hour(time)
+    return floored if floored == time else floored + datetime.timedelta(hours=1)
+
+
+def _floor_day(time):
+    return _floor_hour(time).replace(hour=0)
+
+
+def _ceil_day(time):
+    floored = _floor_day(time)
+    return floored if floored == time else floored + datetime.timedelta(days=1)
+
+
+async def count_events(con, events=(), *, facets=None, guild_id=None, since=None, until=None):
+    """Counts logged events from the rollup tables, grouped by facet.
+
+    Counts without a time window are read from `statistics_totals`.
+    A time window is counted from `statistics_daily` for its whole days
+    and from `statistics_hourly` for the hours at either end, so the
+    work depends on the length of the window but not on the amount of
+    events in it.
+
+    Parameters
+    ----------
+    con: Union[asyncpg.connection.Connection, :class:`utils.connection.LazyConnection`]
+        The connection to query with.
+    Optional[events: Sequence[str]]
+        The events to count. Every event is counted if empty.
+    Optional[facets: Sequence[str]]
+        The facets to count. Every facet except `''` is counted if `None`.
+    Optional[guild_id: int]
+        The guild to count events in, `0` for DMs. Every guild is counted if `None`.
+    Optional[since: datetime.datetime]
+        The UTC time to count from, rounded down to the hour.
+    Optional[until: datetime.datetime]
+        The UTC time to count until, rounded up to the hour.
+
+    Returns
+    -------
+    Counter:
+        The amount of events per facet.
+    """
+    params = []
+    conditions = []
+
+    def param(value):
+        params.append(value)
+        return f'${len(params)}'
+
+    if events:
+        conditions.append(f'event_name = ANY({param(list(events))}::text[])')
+    if facets is None:
+        conditions.append("facet <> ''")
+    else:
+        conditions.append(f'facet = ANY({param(list(facets))}::text[])')
+    if guild_id is not None:
+        conditions.append(f'guild_id = {param(guild_id)}')
+    where = ' AND '.join(conditions)
+
+    if since is None and until is None:
+        query = f'SELECT facet, count FROM statistics_totals WHERE {where}'
+    else:
+        start = None if since is None else _floor_hour(since)
+        end = None if until is None else _ceil_hour(until)
+        first_day = None if start is None else _ceil_day(start)
+        last_day = None if end is None else _floor_day(end)
+        parts = []
+
+        def part(table, column, lower, upper):
+            bounds = ''.join((f' AND {column} >= {param(lower)}' if lower is not None else '',
+                              f' AND {column} < {param(upper)}' if upper is not None else ''))
+            parts.append(f'SELECT facet, count FROM {table} WHERE {where}{bounds}')
+
+        if first_day is not None and last_day is not None and first_day >= last_day:
+            part('statistics_hourly', 'hour', start, end)
+        else:
+            part('statistics_daily', 'day', first_day and first_day.date(), last_day and last_day.date())
+            if start is not None and start < first_day:
+                part('statistics_hourly', 'hour', start, first_day)
+            if end is not None and last_day < end:
+                part('statistics_hourly', 'hour', last_day, end)
+        query = ' UNION ALL '.join(parts)
+
+    records = await con.fetch(f'SELECT facet, SUM(count)::bigint FROM ({query}) counts GROUP BY facet', *params)
+    return Counter({facet: count for facet, count in records})
@@ -0,0 +1,123 @@
+from collections import namedtuple, defaultdict
+
+from utils.menus import ARROWS
+from utils.orm import xp_to_level
+
+EvolutionEdge = namedtuple('EvolutionEdge', 'num next level item trade trade_for')
+EvolutionEdge.__doc__ = """An edge of the :class:`EvolutionGraph` from `num` to `next`.
+
+Attributes
+----------
+num: int
+    The num that evolves.
+next: int
+    The num that is evolved into.
+level: int
+    The level needed to evolve. 1 and 100 mean no level is needed.
+item: Union[str, None]
+    The item needed to evolve.
+trade: bool
+    Whether or not the Pokemon evolves when traded.
+trade_for: Union[int, None]
+    The num the Pokemon must be traded for to evolve.
+"""
+
+
+class EvolutionGraph:
+    """A directed graph compiled from the `evolutions` table.
+
+    Parameters
+    ----------
+    catalog: :class:`utils.catalog.Catalog`
+        The catalog to read the `evolutions` and `pokemon` rows from.
+    """
+    def __init__(self, catalog):
+        self.catalog = catalog
+        successors = defaultdict(list)
+        predecessors = defaultdict(list)
+        for row in catalog.evolutions:
+            if row['next'] is None:
+                continue
+            edge = EvolutionEdge(row['num'], row['next'], row['level'], row['item'], row['trade'], row['trade_for'])
+            successors[edge.num].append(edge)
+            predecessors[edge.next].append(edge)
+        self._successors = {num: tuple(edges) for num, edges in successors.items()}
+        self._predecessors = {num: tuple(edges) for num, edges in predecessors.items()}
+        self._chains = {}
+
+    def successors(self, num: int):
+        """Returns the :class:`EvolutionEdge` tuple that a num can evolve through."""
+        return self._successors.get(num, ())
+
+    def predecessors(self, num: int):
+        """Returns the :class:`EvolutionEdge` tuple that evolves into a num."""
+        return self._predecessors.get(num, ())
+
+    def get_evolution(self, num: int, exp: int, item=None, trading=False, trade_for=()):
+        """Returns the num that a Pokemon evolves into.
+
+        Parameters
+        ----------
+        num: int
+            The num of the Pokemon.
+        exp: int
+            The amount of experience the Pokemon has.
+        Optional[item: str]
+            The item that the Pokemon holds.
+        Optional[trading: bool]
+            Whether or not the Pokemon is being traded.
+        Optional[trade_for: Iterable[int]]
+            The nums of the Pokemon it is being traded for.
+
+        Returns
+        -------
+        Union[int, None]:
+            The num to evolve into, or `None` if the Pokemon does not evolve.
+        """
+        for edge in self.successors(num):
+            if edge.level not in (1, 100) and exp < xp_to_level(edge.level):
+                continue
+            if edge.trade_for is not None and edge.trade and trading:
+                if edge.trade_for in trade_for:
+                    return edge.next
+            elif edge.trade == trading:
+                return edge.next
+            elif edge.item == item:
+                return edge.next
+
+    def get_display_name(self, num: int):
+        mon = self.catalog.get_pokemon(num)
+        return mon.base_name + mon.star
+
+    def get_chain(self, num: int):
+        """Returns a nicely formatted string of the evolution chain through a num.
+
+        The string is rendered once per num and then memoized.
+        """
+        try:
+            return self._chains[num]
+        except KeyError:
+            pass
+        start = [num]
+        previous = self.predecessors(num)
+        while previous and previous[0].num not in start:
+            start.insert(0, previous[0].num)
+            previous = self.predecessors(previous[0].num)
+        after = self.successors(num)
+        if len(start) == 1 and not after:
+            chain = 'This Pokémon does not evolve.'
+        else:
+            start = '\N{BALLOT BOX WITH CHECK}'.join(map(self.get_display_name, start))
+            chains = []
+            if not after:
+                chains.append(start)
+            for edge in after:
+                name = self.get_display_name(edge.next)
+                following = self.successors(edge.next)
+                if not following:
+                    chains.append(ARROWS[1].join((start, name)))
+                for next_edge in following:
+                    chains.append(ARROWS[1].join((start, name, self.get_display_name(next_edge.next))))
+            chain = '\n'.join(chains)
+        self._chains[num] = chain
+        return chain
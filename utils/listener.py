@@ -0,0 +1,110 @@
+import traceback
+import asyncio
+
+import asyncpg
+
+
+class Listener:
+    """Keeps an in-memory copy of a table in sync through LISTEN/NOTIFY.
+
+    Listens on :attr:`channel` on a dedicated connection, not taken from
+    the pool, so changes made by other processes sharing the DB are
+    received too. If the connection is lost, e.g. to a server restart,
+    it is reconnected in the background and :meth:`load` is run again,
+    since notifications sent in between are missed.
+
+    The listener is added before :meth:`load`, and notifications received
+    while loading are queued and replayed after :meth:`reset`, since they
+    may or may not be in the loaded data.
+
+    Subclasses set :attr:`channel` and implement :meth:`apply`, and
+    :meth:`load` and :meth:`reset` if they load the table.
+
+    Parameters
+    ----------
+    dsn: str
+        The DSN to connect to the DB with.
+    Optional[retry_interval: float]
+        The maximum seconds between attempts to reconnect.
+    """
+    channel = None
+
+    def __init__(self, dsn, *, retry_interval=60):
+        self.dsn = dsn
+        self.retry_interval = retry_interval
+        self._con = None
+        self._queued = None
+        self._reconnect_task = None
+        self._closed = False
+
+    async def start(self):
+        """Connects, listens for changes and loads the table."""
+        self._closed = False
+        await self._connect()
+
+    async def load(self, con):
+        """Returns the data to pass to :meth:`reset`, read with the listening connection."""
+
+    def reset(self, data):
+        """Replaces the in-memory copy with the data from :meth:`load`."""
+
+    def apply(self, pid: int, payload: str):
+        """Applies a notification sent by the backend with the PID."""
+        raise NotImplementedError
+
+    async def _connect(self):
+        con = await asyncpg.connect(self.dsn)
+        self._queued = []
+        try:
+            await con.add_listener(self.channel, self._on_notify)
+            data = await self.load(con)
+        except Exception:
+            self._queued = None
+            await con.close()
+            raise
+        con.add_termination_listener(self._on_terminate)
+        self._con = con
+        self.reset(data)
+        queued, self._queued = self._queued, None
+        for pid, payload in queued:
+            self.apply(pid, payload)
+        if con.is_closed():  # Lost before the termination listener was added.
+            self._on_terminate(con)
+
+    def _on_notify(self, con, pid, channel, payload):
+        if self._queued is not None:
+            self._queued.append((pid, payload))
+        else:
+            self.apply(pid, payload)
+
+    def _on_terminate(self, con):
+        if self._closed or con is not self._con:
+            return
+        self._con = None
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self):
+        delay = 1
+        while not self._closed:
+            try:
+                await self._connect()
+            except Exception:
+                traceback.print_exc()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_interval)
+            else:
+                print(f'Reconnected the {self.channel} listener')
+                return
+
+    async def close(self):
+        """Stops listening and closes the listening connection."""
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._con is None:
+            return
+        con, self._con = self._con, None
+        con.remove_termination_listener(self._on_terminate)
+        await con.close()
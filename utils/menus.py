@@ -1,9 +1,10 @@
 from enum import Enum, auto
 import asyncio
 
-from discord.ext import commands
 import discord
 
+from utils.pages import PageSource, ListPageSource
+
 DIGITS = ('\N{DIGIT ONE}\N{COMBINING ENCLOSING KEYCAP}',
           '\N{DIGIT TWO}\N{COMBINING ENCLOSING KEYCAP}',
           '\N{DIGIT THREE}\N{COMBINING ENCLOSING KEYCAP}',
@@ -71,14 +72,10 @@ def get_response(content):
 class Menus:
     async def reaction_prompt(self, message, user, destination, *, timeout=60):
         msg = await destination.send(message)
-        for e in (DONE, CANCEL):
-            await msg.add_reaction(e)
+        self.bot.outbound.add_reactions(msg, (DONE, CANCEL))
         try:
-            def check(reaction, reaction_user):
-                return (reaction.emoji in (DONE, CANCEL) and
-                        reaction.message.id == msg.id and
-                        reaction_user == user)
-            reaction, _ = await self.bot.wait_for('reaction_add', check=check, timeout=timeout)
+            reaction, _ = await self.bot.router.wait_for_reaction(msg.id, user_id=user.id, emojis=(DONE, CANCEL),
+                                                                  timeout=timeout)
         except asyncio.TimeoutError:
             return False
         else:
@@ -92,86 +89,90 @@ class Menus:
 
     async def menu(self, options, user, destination, count=1, *, timeout=60, multi=False, display=None,
                    code=True, per_page=10, header='', return_from=None, allow_none=False, return_id=False):
-        if return_from is None:
-            return_from = options
-        elif len(return_from) != len(options):
-            raise ValueError('return_from length must match that of options')
-        if display is None:
-            display = options
-        elif len(display) != len(options):
-            raise ValueError('display length must match that of options')
+        if isinstance(options, PageSource):
+            source = options
+        else:
+            source = ListPageSource(options, per_page=per_page, display=display, return_from=return_from)
+        try:
+            return await self._run_menu(source, user, destination, count, timeout=timeout, multi=multi,
+                                        code=code, header=header, return_id=return_id)
+        finally:
+            await source.close()
+
+    async def _run_menu(self, source, user, destination, count, *, timeout, multi, code, header, return_id):
         if count:
-            accept = (*MENU_CONTROLS, *range(1, per_page + 1))
-            if count > len(options) and not multi:
-                count = len(options)
+            accept = (*MENU_CONTROLS, *range(1, source.per_page + 1))
+            if source.total is not None and count > source.total and not multi:
+                count = source.total
         else:
             accept = MENU_CONTROLS
-        pag = commands.Paginator(prefix='```' if code else '', suffix='```' if code else '')
-        page_len = 0
-        for ind, line in enumerate(options):
-            if page_len == per_page:
-                pag.close_page()
-                page_len = 0
+        prefix = '```' if code else ''
+
+        def render(entries):
+            if not entries:
+                return 'None'
             if count:
-                pag.add_line(f'{ind % 10 + 1}. {line}')
+                lines = [f'{ind + 1}. {source.format(entry)}' for ind, entry in enumerate(entries)]
             else:
-                pag.add_line(line)
-            page_len += 1
-        if page_len:
-            pag.close_page()
-        pages = pag.pages
-        if not pages:
-            pages = ['None']
-            count = 0
+                lines = [source.format(entry) for entry in entries]
+            return '\n'.join([prefix, *lines, prefix])
+
         page = 0
+        entries = await source.get_page(page)
+        if not entries:
+            count = 0
         header = header + '\n'
         choices = []
-        msg = await destination.send(header + pages[page])
+        msg = await destination.send(header + render(entries))
 
         def check(message):
-            response = get_response(message.content)
-            return (message.author == user and
-                    message.channel == msg.channel and
-                    response in accept)
+            return get_response(message.content) in accept
 
         while True:
             try:
-                message = await self.bot.wait_for('message', check=check, timeout=timeout)
+                message = await self.bot.router.wait_for_message(msg.channel.id, user.id, check=check,
+                                                                 timeout=timeout)
                 response = get_response(message.content)
             except asyncio.TimeoutError:
                 message, response = None, None
             if message is None or response is MenuControl.cancel:
                 if response is MenuControl.cancel:
-                    await message.delete()
-                await msg.delete()
+                    self.bot.outbound.delete(message)
+                self.bot.outbound.delete(msg)
                 return user.id if return_id else None
             elif response in accept[5:]:
-                if response >= pages[page].count('\n'):
+                if response > len(entries):
                     continue
-                await message.delete()
-                choice = page * 10 + response - 1
+                self.bot.outbound.delete(message)
+                choice = entries[response - 1]
                 if choice not in choices or multi:
                     choices.append(choice)
                     if len(choices) == count:
                         break
             elif response is MenuControl.previous:
-                await message.delete()
-                page -= 1
+                self.bot.outbound.delete(message)
+                if page > 0:
+                    page -= 1
+                    entries = await source.get_page(page)
             elif response is MenuControl.next:
-                await message.delete()
-                page += 1
+                self.bot.outbound.delete(message)
+                next_entries = await source.get_page(page + 1)
+                if next_entries:
+                    page += 1
+                    entries = next_entries
             elif response is MenuControl.undo:
-                await message.delete()
-                choices.pop()
+                self.bot.outbound.delete(message)
+                if choices:
+                    choices.pop()
             elif response is MenuControl.done:
-                await message.delete()
+                self.bot.outbound.delete(message)
                 break
-            head = header + pages[page]
+            head = header + render(entries)
             if choices:
-                head += '\n' + 'Selected: ' + ', '.join(map(str, [display[ind] for ind in choices]))
-            await msg.edit(content=head)
-        await msg.delete()
-        return [return_from[ind] for ind in choices]
+                head += '\n' + 'Selected: ' + ', '.join(str(source.display(choice)) for choice in choices)
+            self.bot.outbound.edit(msg, content=head)
+        self.bot.outbound.delete(msg)
+        return [source.value(choice) for choice in choices]
 
 ###################
 #                 #
@@ -184,21 +185,33 @@ class Menus:
                          allow_none=False, return_id=False, display=None, file=None, thumbnail=None, image=None, footer=None, **kwargs):
         if per_page > 20:
             per_page = 20
-        if return_from is None:
-            return_from = options
-        elif len(return_from) != len(options):
-            raise ValueError('return_from length must match that of options')
-        if display is None:
-            display = options
-        elif len(display) != len(options):
-            raise ValueError('display length must match that of options')
         if count:
-            accept = (*MENU_CONTROLS, *range(1, per_page + 1))
-            if count > len(options) and not multi:
-                count = len(options)
             per_page = 10
+        if isinstance(options, PageSource):
+            source = options
+        else:
+            source = ListPageSource(options, per_page=per_page, display=display, return_from=return_from)
+        try:
+            return await self._run_embed_menu(source, field, user, destination, count, timeout=timeout,
+                                              multi=multi, return_id=return_id, file=file, thumbnail=thumbnail,
+                                              image=image, footer=footer, **kwargs)
+        finally:
+            await source.close()
+
+    async def _run_embed_menu(self, source, field, user, destination, count, *, timeout, multi, return_id, file,
+                              thumbnail, image, footer, **kwargs):
+        if count:
+            accept = (*MENU_CONTROLS, *range(1, source.per_page + 1))
+            if source.total is not None and count > source.total and not multi:
+                count = source.total
         else:
             accept = MENU_CONTROLS
+
+        def render(entries):
+            if count:
+                return ''.join(f'{ind + 1}. {source.format(entry)}\n' for ind, entry in enumerate(entries))
+            return ''.join(f'{source.format(entry)}\n' for entry in entries)
+
         em = discord.Embed(**kwargs)
         if thumbnail:
             em.set_thumbnail(url=thumbnail)
@@ -206,66 +219,59 @@ class Menus:
             em.set_image(url=image)
         if footer:
             em.set_footer(text=footer)
-        em.add_field(name=field, value='')
-        pages = ['']
-        page_len = 0
-        for ind, line in enumerate(options):
-            if page_len == per_page:
-                pages.append('')
-                page_len = 0
-            if count:
-                pages[-1] += f'{ind % 10 + 1}. {line}\n'
-            else:
-                pages[-1] += f'{line}\n'
-            page_len += 1
         page = 0
-        em._fields[0]['value'] = pages[page]
+        entries = await source.get_page(page)
+        em.add_field(name=field, value=render(entries))
         choices = []
         msg = await destination.send(embed=em, file=file)
 
         def check(message):
-            response = get_response(message.content)
-            return (message.author == user and
-                    message.channel == msg.channel and
-                    response in accept)
+            return get_response(message.content) in accept
 
         while True:
             try:
-                message = await self.bot.wait_for('message', check=check, timeout=timeout)
+                message = await self.bot.router.wait_for_message(msg.channel.id, user.id, check=check,
+                                                                 timeout=timeout)
                 response = get_response(message.content)
             except asyncio.TimeoutError:
                 message, response = None, None
             if message is None or response is MenuControl.cancel:
                 if response is MenuControl.cancel:
-                    await message.delete()
-                await msg.delete()
+                    self.bot.outbound.delete(message)
+                self.bot.outbound.delete(msg)
                 return user.id if return_id else None
             elif response in accept[5:]:
-                if response > pages[page].count('\n'):
+                if response > len(entries):
                     continue
-                await message.delete()
-                choice = page * 10 + response - 1
+                self.bot.outbound.delete(message)
+                choice = entries[response - 1]
                 if choice not in choices or multi:
                     choices.append(choice)
                     if len(choices) == count:
                         break
             elif response is MenuControl.previous:
-                await message.delete()
-                page -= 1
+                self.bot.outbound.delete(message)
+                if page > 0:
+                    page -= 1
+                    entries = await source.get_page(page)
             elif response is MenuControl.next:
-                await message.delete()
-                page += 1
+                self.bot.outbound.delete(message)
+                next_entries = await source.get_page(page + 1)
+                if next_entries:
+                    page += 1
+                    entries = next_entries
             elif response is MenuControl.undo:
-                await message.delete()
-                choices.pop()
+                self.bot.outbound.delete(message)
+                if choices:
+                    choices.pop()
             elif response is MenuControl.done:
-                await message.delete()
+                self.bot.outbound.delete(message)
                 break
             if choices:
-                em.description = kwargs.get('description', '') + '\n' + 'Selected: ' + ', '.join(map(str, [display[ind] for ind in choices]))
+                em.description = kwargs.get('description', '') + '\n' + 'Selected: ' + ', '.join(str(source.display(choice)) for choice in choices)
             else:
                 em.description = kwargs.get('description')
-            em._fields[0]['value'] = pages[page]
-            await msg.edit(embed=em)
-        await msg.delete()
-        return [return_from[ind] for ind in choices]
+            em._fields[0]['value'] = render(entries)
+            self.bot.outbound.edit(msg, embed=em)
+        self.bot.outbound.delete(msg)
+        return [source.value(choice) for choice in choices]
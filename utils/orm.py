@@ -1,12 +1,11 @@
-from collections import Counter
+from collections import Counter, namedtuple
 import typing
+import random
 import math
 
-from fuzzywuzzy import process
-import discord
-
-from utils.menus import STAR, GLOWING_STAR, ARROWS
 from utils.errors import PokemonNotFound
+from utils.pages import KeysetPageSource
+from utils import stats
 
 
 def xp_to_level(level: int):
@@ -44,28 +43,77 @@ def level_from_xp(exp: int):
     return level
 
 
+def shiny_from_personality(personality: int, user_id: int, secret_id: int):
+    """Returns whether a personality is shiny for a trainer.
+
+    Parameters
+    ----------
+    personality: int
+        The 32-bit personality of the Pokemon.
+    user_id: int
+        The user ID of the Pokemon's original trainer.
+    secret_id: int
+        The secret ID of the Pokemon's original trainer.
+
+    Returns
+    -------
+    bool:
+        Whether or not the Pokemon is shiny.
+    """
+    upper, lower = (personality >> 16) & 0xFFFF, personality & 0xFFFF
+    return (((user_id % 65536) ^ secret_id) ^ (upper ^ lower)) <= int((65536 / 400))
+
+
+Sale = namedtuple('Sale', 'ids nums total')
+Sale.__doc__ = """The Pokemon sold by :meth:`Trainer.sell_pokemon` or :meth:`Trainer.sell_duplicates`.
+
+Attributes
+----------
+ids: List[int]
+    The `found.id` of each sold Pokemon, ordered by num.
+nums: List[int]
+    The num of each sold Pokemon, in the same order as `ids`.
+total: int
+    The money the :class:`Trainer` received.
+"""
+
+
+CollectionCounts = namedtuple('CollectionCounts', 'total legendary mythical')
+CollectionCounts.__doc__ = """The size of a :class:`Trainer`'s PC or Pokedex.
+
+Attributes
+----------
+total: int
+    The amount of Pokemon.
+legendary: int
+    The amount of legendary Pokemon that are not mythical.
+mythical: int
+    The amount of mythical Pokemon.
+"""
+
+
 async def get_all_pokemon(ctx):
     """Retrieve all stored :class:`Pokemon`.
 
     Parameters
     ----------
     ctx: discord.commands.Context
-        The ctx used for connecting with the DB.
+        The ctx used for accessing the catalog.
 
     Returns
     -------
     List[:class:`Pokemon`]:
         A list of all the stored :class:`Pokemon`.
     """
-    pokemon = await ctx.con.fetch("""
-        SELECT num FROM pokemon
-        """)
-    return [await Pokemon.from_num(ctx, p['num']) for p in pokemon]
+    return [Pokemon(ctx, p) for p in ctx.bot.catalog.pokemon]
 
 
 class Record:
     """Represents a record from the DB in the form of an object.
 
+    Subclasses declare every column in `__slots__`, so no
+    per-instance `__dict__` is allocated.
+
     Parameters
     ----------
     ctx: discord.commands.Context
@@ -73,9 +121,12 @@ class Record:
     rec: asyncpg.Record
         The record to create the object from.
     """
+    __slots__ = ('ctx',)
+
     def __init__(self, ctx, rec):
         self.ctx = ctx
-        self.__dict__.update(rec)
+        for key, value in rec.items():
+            setattr(self, key, value)
 
 
 class Trainer(Record):
@@ -87,13 +138,20 @@ class Trainer(Record):
         The user ID of the :class:`Trainer`.
     secret_id: int
         The secret ID of the :class:`Trainer`.
-    inventory: json
+    inventory: collections.Counter
         The :class:`Trainer`'s inventory.
+    user: Union[discord.User, discord.Member, None]
+        The :class:`Trainer`'s user.
     """
+    __slots__ = ('user_id', 'secret_id', 'inventory', 'user')
+
     @classmethod
     async def from_user_id(cls, ctx, user_id: int):
         """Constructs a :class:`Trainer` from a user ID.
 
+        The trainer is read through :class:`utils.trainers.TrainerCache`
+        and created if it does not exist.
+
         Parameters
         ----------
         ctx: discord.commands.Context
@@ -101,38 +159,151 @@ class Trainer(Record):
         user_id: int
             The ID of the user to construct the :class:`Trainer` from.
         """
-        try:
-            query = ctx._trainer_from_user_id
-        except AttributeError:
-            query = ctx._trainer_from_user_id = await ctx.con.prepare("""
-                INSERT INTO trainers (user_id) VALUES ($1)
-                ON CONFLICT (user_id) DO UPDATE SET user_id=$1
-                RETURNING *
-                """)
-        player_data = await query.fetchrow(user_id)
+        player_data = await ctx.bot.trainers.get(ctx.con, user_id)
         c = cls(ctx, player_data)
         if ctx.guild is not None:
             c.user = ctx.guild.get_member(user_id)
         else:
-            c.user = discord.utils.get(list(ctx.bot.get_all_members()), id=user_id)
-        c.inventory = Counter(c.inventory)
+            c.user = await ctx.bot.user_cache.get(user_id)
 
         return c
 
-    async def set_inventory(self, inventory: dict):
-        """Sets the inventory of the :class:`Trainer`.
+    async def update_inventory(self, deltas: dict):
+        """Adds to the counts in the :class:`Trainer`'s inventory.
+
+        The counts are added by the DB in one statement, so concurrent
+        updates are never lost. Nothing is changed if any count would
+        become negative, and counts that become zero are removed.
 
         Parameters
         ----------
-        inventory: json
-            The inventory to replace the current :class:`Trainer`'s inventory.
+        deltas: dict
+            The amount to add to each item, negative to remove.
+
+        Returns
+        -------
+        bool:
+            Whether or not the inventory was updated.
         """
-        inventory = +Counter(inventory)
-        await self.ctx.con.execute("""
-            UPDATE trainers SET inventory = $1 WHERE user_id = $2
-            """, inventory, self.user_id)
+        inventory = await self.ctx.bot.statements.fetchval(
+            self.ctx.con, 'trainer_update_inventory', self.user_id, {k: v for k, v in deltas.items() if v})
+        if inventory is None:
+            self.ctx.bot.trainers.invalidate(self.user_id)
+            return False
+        self.ctx.bot.trainers.set_inventory(self.user_id, inventory)
+        self.inventory = Counter(inventory)
+        return True
+
+    async def _sell(self, statement, *args):
+        ids, nums, total, inventory = await self.ctx.bot.statements.fetchrow(self.ctx.con, statement,
+                                                                             self.user_id, *args)
+        if inventory is not None:
+            self.ctx.bot.trainers.set_inventory(self.user_id, inventory)
+            self.inventory = Counter(inventory)
+        return Sale(ids, nums, total)
+
+    async def sell_pokemon(self, found_ids):
+        """Sells Pokemon owned by the :class:`Trainer` in one statement.
+
+        Each Pokemon sells for 100, 600 if legendary or 1000 if mythical,
+        plus 1000 if shiny. Pokemon that the :class:`Trainer` no longer
+        owns are skipped.
+
+        Parameters
+        ----------
+        found_ids: Iterable[int]
+            The `found.id` of each Pokemon to sell.
+
+        Returns
+        -------
+        :class:`Sale`:
+            The Pokemon that were sold.
+        """
+        return await self._sell('trainer_sell', list(found_ids))
+
+    async def sell_duplicates(self, keep=1):
+        """Sells every non-shiny Pokemon beyond the first few of each num in one statement.
+
+        Party members are never sold, and the rest are kept in order of most experience.
+
+        Parameters
+        ----------
+        Optional[keep: int]
+            The amount of non-shiny Pokemon of each num to keep.
+
+        Returns
+        -------
+        :class:`Sale`:
+            The Pokemon that were sold.
+        """
+        return await self._sell('trainer_sell_duplicates', keep)
+
+    async def get_pc_counts(self):
+        """Count the Pokemon in the :class:`Trainer`'s PC.
+
+        Returns
+        -------
+        :class:`CollectionCounts`:
+            The amount of owned Pokemon.
+        """
+        record = await self.ctx.bot.statements.fetchrow(self.ctx.con, 'trainer_pc_counts', self.user_id)
+        return CollectionCounts(*record)
+
+    async def get_seen_counts(self):
+        """Count the Pokemon that the :class:`Trainer` has seen.
+
+        Returns
+        -------
+        :class:`CollectionCounts`:
+            The amount of seen Pokemon.
+        """
+        record = await self.ctx.bot.statements.fetchrow(self.ctx.con, 'trainer_seen_counts', self.user_id)
+        return CollectionCounts(*record)
+
+    def get_pc_pages(self, formatter, *, per_page=10, total=None):
+        """Page through the :class:`Trainer`'s PC without reading all of it.
+
+        Party members are listed individually, and every other num,
+        form_id, shiny and name combination is listed once with its count.
+
+        Parameters
+        ----------
+        formatter: Callable[[asyncpg.Record], str]
+            Returns the line a row is listed as. Rows have party_position,
+            num, form_id, shiny, name and count.
+        Optional[per_page: int]
+            The maximum amount of rows on a page.
+        Optional[total: int]
+            The amount of rows, if it is known.
+
+        Returns
+        -------
+        :class:`utils.pages.KeysetPageSource`:
+            The pages of the PC, for :meth:`utils.menus.Menus.menu`.
+        """
+        return KeysetPageSource(self.ctx.bot, 'trainer_pc_page', (self.user_id,), start=(-1, 0, 0, False, ''),
+                                key=lambda r: (r['position'], r['num'], r['form_id'], r['shiny'], r['name_key']),
+                                formatter=formatter, per_page=per_page, total=total)
+
+    def get_seen_pages(self, formatter, *, per_page=10, total=None):
+        """Page through the Pokemon that the :class:`Trainer` has seen.
+
+        Parameters
+        ----------
+        formatter: Callable[[asyncpg.Record], str]
+            Returns the line a row is listed as. Rows only have num.
+        Optional[per_page: int]
+            The maximum amount of rows on a page.
+        Optional[total: int]
+            The amount of rows, if it is known.
 
-        self.inventory = inventory
+        Returns
+        -------
+        :class:`utils.pages.KeysetPageSource`:
+            The pages of the Pokedex, for :meth:`utils.menus.Menus.menu`.
+        """
+        return KeysetPageSource(self.ctx.bot, 'trainer_seen_page', (self.user_id,), start=(0,),
+                                key=lambda r: (r['num'],), formatter=formatter, per_page=per_page, total=total)
 
     async def get_pokemon(self, party=False, seen=False):
         """Retrieve all Pokemon of the :class:`Trainer`.
@@ -149,21 +320,16 @@ class Trainer(Record):
         List[:class:`FoundPokemon`]:
             The list of Pokemon for the :class:`Trainer`.
         """
+        statements = self.ctx.bot.statements
         if party:
-            pokemon = await self.ctx.con.fetch("""
-                SELECT * FROM found WHERE owner=$1 AND party_position IS NOT NULL ORDER BY party_position
-                """, self.user_id)
+            pokemon = await statements.fetch(self.ctx.con, 'trainer_party', self.user_id)
         elif seen:
-            pokemon = await self.ctx.con.fetch("""
-                SELECT * FROM seen WHERE user_id=$1 ORDER BY num
-                """, self.user_id)
+            pokemon = await statements.fetch(self.ctx.con, 'trainer_seen', self.user_id)
             return [await Pokemon.from_num(self.ctx, p['num']) for p in pokemon]
         else:
-            pokemon = await self.ctx.con.fetch("""
-                SELECT * FROM found WHERE owner=$1 ORDER BY party_position, num, form_id, id
-                """, self.user_id)
+            pokemon = await statements.fetch(self.ctx.con, 'trainer_pokemon', self.user_id)
 
-        return [await FoundPokemon.from_id(self.ctx, p['id']) for p in pokemon]
+        return [FoundPokemon.from_record(self.ctx, p) for p in pokemon]
 
     async def see(self, pokemon: typing.Union['Pokemon', typing.List['Pokemon']]):
         """Mark a Pokemon or a list of Pokemon as seen.
@@ -174,16 +340,12 @@ class Trainer(Record):
             The :class:`Pokemon` or list of :class:`Pokemon` to mark
             as seen for the :class:`Trainer`.
         """
+        statements = self.ctx.bot.statements
         if isinstance(pokemon, Pokemon):
-            await self.ctx.con.execute("""
-                INSERT INTO seen (user_id, num) VALUES ($1, $2)
-                ON CONFLICT DO NOTHING
-                """, self.user_id, pokemon.num)
+            await statements.execute(self.ctx.con, 'trainer_see', self.user_id, pokemon.num)
         else:
-            await self.ctx.con.executemany("""
-                INSERT INTO seen (user_id, num) VALUES ($1, $2)
-                ON CONFLICT DO NOTHING
-                """, [(self.user_id, p.num) for p in pokemon])
+            await self.ctx.con.executemany(statements.statements['trainer_see'],
+                                           [(self.user_id, p.num) for p in pokemon])
 
     async def add_caught_pokemon(self, pokemon: 'Pokemon', ball):
         """Add a :class:`Pokemon` to the :class:`Trainer`'s pokemon.
@@ -200,23 +362,12 @@ class Trainer(Record):
         :class:`FoundPokemon`:
             The owned version of the :class:`Pokemon`.
         """
-        try:
-            level_query = self.ctx._level_query
-        except AttributeError:
-            level_query = self.ctx._level_query = await self.ctx.con.prepare("""
-              SELECT level FROM evolutions WHERE next = $1
-              """)
-        level = await level_query.fetchval(pokemon.num) or 0
-
-        try:
-            insert_query = self.ctx._insert_query
-        except AttributeError:
-            insert_query = self.ctx._insert_query = await self.ctx.con.prepare("""
-                INSERT INTO found (num, form_id, ball, exp, owner, original_owner, personality) VALUES ($1, $2, $3, $4, $5, $6, $7) RETURNING id
-                """)
-
-        found_id = await insert_query.fetchval(pokemon.num, pokemon.form_id, ball, xp_to_level(level), self.user_id,
-                                               self.user_id, pokemon.personality)
+        pre_evolutions = self.ctx.bot.catalog.evolution_graph.predecessors(pokemon.num)
+        level = pre_evolutions[0].level if pre_evolutions else 0
+
+        found_id = await self.ctx.bot.statements.fetchval(
+            self.ctx.con, 'found_insert', pokemon.num, pokemon.form_id, ball, xp_to_level(level), self.user_id,
+            self.user_id, pokemon.personality)
 
         return await FoundPokemon.from_id(self.ctx, found_id)
 
@@ -225,10 +376,26 @@ class Trainer(Record):
 
 
 class Pokemon(Record):
-    """Represents a row from the `pokemon` table.
+    """Represents a Pokemon of a :class:`utils.catalog.Species`.
+
+    Every column of the `pokemon` table is read from the shared
+    :class:`utils.catalog.Species` instead of being copied.
+
+    Parameters
+    ----------
+    ctx: discord.commands.Context
+        The ctx used for connecting with the DB.
+    species: :class:`utils.catalog.Species`
+        The species of the :class:`Pokemon`.
 
     Attributes
     ----------
+    species: :class:`utils.catalog.Species`
+        The species of the :class:`Pokemon`.
+    personality: Union[int, None]
+        The :class:`Pokemon`'s personality, if it was encountered.
+    shiny: bool
+        Whether or not the :class:`Pokemon` is shiny.
     num: int
         The :class:`Pokemon`'s num.
     display_name: str
@@ -278,6 +445,19 @@ class Pokemon(Record):
     speed_yield: int
         The speed this :class:`Pokemon` yields when losing battles.
     """
+    __slots__ = ('species', 'personality', 'shiny')
+
+    def __init__(self, ctx, species):
+        self.ctx = ctx
+        self.species = species
+        self.personality = None
+        self.shiny = False
+
+    def __getattr__(self, name):
+        if name == 'species':
+            raise AttributeError(name)
+        return getattr(self.species, name)
+
     @classmethod
     async def from_num(cls, ctx, num: int, form_id=0):
         """Constructs a :class:`Pokemon` from a num.
@@ -285,7 +465,7 @@ class Pokemon(Record):
         Parameters
         ----------
         ctx: discord.commands.Context
-            The ctx to use when connecting with the DB.
+            The ctx to use when accessing the catalog.
         num: int
             The num to use when constructing.
         Optional[form_id: int]
@@ -296,59 +476,38 @@ class Pokemon(Record):
         :class:`Pokemon`:
             The constructed :class:`Pokemon` object.
         """
-        try:
-            query = ctx._pokemon_from_num
-        except AttributeError:
-            query = ctx._pokemon_from_num = await ctx.con.prepare("""
-                SELECT *, (SELECT ARRAY(SELECT color FROM types WHERE types.name = ANY(type))) AS colors
-                FROM pokemon WHERE num=$1 AND form_id=$2 LIMIT 1
-                """)
-
-        mon_data = await query.fetchrow(num, form_id)
-        c = cls(ctx, mon_data)
-        c.assign_extra_data()
-
-        return c
+        return cls(ctx, ctx.bot.catalog.get_pokemon(num, form_id))
 
     @classmethod
-    async def from_name(cls, ctx, name: str, form_id=0):
-        """Constructs a :class:`Pokemon` from a name.
+    async def from_name(cls, ctx, name: str, form_id=None):
+        """Constructs a :class:`Pokemon` from a fuzzy matched name.
 
         Parameters
         ----------
         ctx: discord.commands.Context
-            The ctx to use when connecting with the DB.
+            The ctx to use when accessing the catalog.
         name: str
             The name to use when constructing.
         Optional[form_id: int]
-            The form_id to also match when constructing.
+            The form_id to construct. Defaults to the matched form.
 
         Returns
         -------
         :class:`Pokemon`:
             The constructed :class:`Pokemon` object.
+
+        Raises
+        ------
+        PokemonNotFound
+            No Pokemon matched the name closely enough.
         """
-        try:
-            name_query = ctx._pokemon_names
-        except AttributeError:
-            name_query = ctx._pokemon_names = await ctx.con.prepare("""
-                SELECT name FROM pokemon
-                """)
-        try:
-            query = ctx._pokemon_from_name
-        except AttributeError:
-            query = ctx._pokemon_from_name = await ctx.con.prepare("""
-                SELECT num FROM pokemon WHERE name=$1 AND form_id=$2
-                """)
-
-        names = [mon['name'] for mon in await name_query.fetch()]
-        match, percent = process.extractOne(name, names)
-        if percent < 70:
+        match = await ctx.bot.catalog.names.search(name)
+        if match is None:
             raise PokemonNotFound(f'Pokemon not found with name: {name}')
-
-        num = await query.fetchval(match, form_id)
-
-        return cls.from_num(ctx, num)
+        species = match[0]
+        if form_id is not None:
+            species = ctx.bot.catalog.get_pokemon(species.num, form_id)
+        return cls(ctx, species)
 
     @classmethod
     async def random(cls, ctx, trainer):
@@ -357,7 +516,8 @@ class Pokemon(Record):
         Parameters
         ----------
         ctx: discord.commands.Context
-            The ctx to use when connecting with the DB.
+            The ctx to use when sampling the :class:`Pokemon`.
+            Its guild selects the encounter weights.
         trainer: :class:`Trainer`
             The trainer that encountered the :class:`Pokemon`.
             Used for detecting if the :class:`Pokemon` is shiny.
@@ -367,46 +527,20 @@ class Pokemon(Record):
         :class:`Pokemon`:
             The constructed :class:`Pokemon` object.
         """
-        try:
-            query = ctx._pokemon_random
-        except AttributeError:
-            query = ctx._pokemon_random = await ctx.con.prepare("""
-            SELECT *, rand(4294967295) as personality,
-            (SELECT ARRAY(SELECT color FROM types WHERE types.name = ANY(type))) AS colors
-            FROM pokemon ORDER BY random() LIMIT 1
-            """)
-
-        mon = await query.fetchrow()
+        mon = ctx.bot.encounters.sample(ctx.guild.id if ctx.guild is not None else None)
 
         c = cls(ctx, mon)
-        c.assign_extra_data()
+        c.personality = random.getrandbits(32)
         c.shiny = await c.is_shiny(trainer=trainer)
 
         return c
 
-    def assign_extra_data(self):
-        self.color = self.get_color()
-        self.star = self.get_star()
-        if 'display_name' not in self.__dict__:
-            if self.form:
-                self.display_name = f'{self.form} {self.base_name}'
-            else:
-                self.display_name = self.base_name
-
     async def is_shiny(self, trainer=None):
-        b = bin(self.personality)[2:].zfill(32)
-        upper, lower = int(b[:16], 2), int(b[16:], 2)
         if trainer:
             original_trainer = trainer
         else:
             original_trainer = await Trainer.from_user_id(self.ctx, self.original_owner)
-        return (((original_trainer.user_id % 65536) ^ original_trainer.secret_id) ^ (upper ^ lower)) <= int((65536 / 400))
-
-    def get_star(self):
-        return GLOWING_STAR if self.mythical else STAR if self.legendary else ''
-
-    def get_color(self):
-        return round(sum(self.colors) / len(self.colors))
+        return shiny_from_personality(self.personality, original_trainer.user_id, original_trainer.secret_id)
 
     async def get_evolution_chain(self):
         """Returns a nicely formatted string of the :class:`Pokemon`'s evolution chain.
@@ -416,48 +550,7 @@ class Pokemon(Record):
         str:
             The string of the :class:`Pokemon`'s evolution chain.
         """
-        chain = [await self.ctx.con.fetchrow("""
-            SELECT prev, next,
-            (SELECT base_name || (CASE WHEN mythical THEN $2 WHEN legendary THEN $3 ELSE '' END) FROM pokemon p WHERE p.num = e.num LIMIT 1) AS base_name
-            FROM evolutions e WHERE num = $1
-            """, self.num, GLOWING_STAR, STAR)]
-        cur_ind = 0
-        if chain[0]['prev'] is not None:
-            chain.insert(0, await self.ctx.con.fetchrow("""
-                SELECT prev,
-                (SELECT base_name || (CASE WHEN mythical THEN $2 WHEN legendary THEN $3 ELSE '' END) FROM pokemon p WHERE p.num = e.num LIMIT 1) AS base_name
-                FROM evolutions e WHERE next = $1
-                """, self.num, GLOWING_STAR, STAR))
-            cur_ind += 1
-            if chain[0]['prev'] is not None:
-                chain.insert(0, await self.ctx.con.fetchrow("""
-                    SELECT base_name || (CASE WHEN mythical THEN $2 WHEN legendary THEN $3 ELSE '' END) AS base_name FROM pokemon WHERE num = $1 LIMIT 1
-                    """, chain[0]['prev'], GLOWING_STAR, STAR))
-                cur_ind += 1
-        if chain[-1]['next'] is not None:
-            chain.extend(await self.ctx.con.fetch("""
-                SELECT
-                (SELECT base_name || (CASE WHEN mythical THEN $2 WHEN legendary THEN $3 ELSE '' END) FROM pokemon p WHERE p.num = e.num LIMIT 1) AS base_name,
-                (SELECT ARRAY(SELECT (SELECT base_name || (CASE WHEN mythical THEN $2 WHEN legendary THEN $3 ELSE '' END) AS base_name FROM pokemon p WHERE p.num = e2.num LIMIT 1)
-                              FROM evolutions e2 WHERE e2.num = e.next)) AS next
-                FROM evolutions e WHERE prev = $1
-                """, self.num, GLOWING_STAR, STAR))
-        if len(chain) == 1:
-            return 'This Pokémon does not evolve.'
-        start = '\N{BALLOT BOX WITH CHECK}'.join(r['base_name'] for r in chain[:cur_ind + 1])
-        after = chain[cur_ind + 1:]
-        chains = []
-        if not after:
-            chains.append(start)
-        else:
-            for m in after:
-                m = dict(m)
-                if not m['next']:
-                    chains.append(ARROWS[1].join((start, m['base_name'])))
-                else:
-                    for name in m['next']:
-                        chains.append(ARROWS[1].join((start, m['base_name'], name)))
-        return '\n'.join(chains)
+        return self.ctx.bot.catalog.evolution_graph.get_chain(self.num)
 
     def __repr__(self):
         return f'<Pokemon num={self.num} name={self.base_name}>'
@@ -477,7 +570,7 @@ class FoundPokemon(Pokemon):
     exp: int
         The amount of experience the :class:`FoundPokemon` has.
     level: int
-        The :class:`FoundPokemon`'s level.
+        The :class:`FoundPokemon`'s level, stored from its `exp`.
     item: str
         The item that the :class:`FoundPokemon` uses to evolve.
     party_position: Union[int, None]
@@ -491,16 +584,27 @@ class FoundPokemon(Pokemon):
         ???
     personality: int
         The :class:`FoundPokemon`'s personality.
-    nature: str
-        The :class:`FoundPokemon`'s nature.
+    nature_mod: int
+        The :class:`FoundPokemon`'s nature mod, stored from its `personality`.
+    nature: Mapping
+        The :class:`FoundPokemon`'s `natures` row.
     shiny: bool
         Whether or not the :class:`FoundPokemon` is shiny.
-    evolution_info: List[asyncpg.Record]
-        A list of evolution records for the :class:`FoundPokemon`.
+        Stored when the :class:`FoundPokemon` is inserted.
+    evolution_info: Tuple[:class:`utils.evolution.EvolutionEdge`]
+        The evolutions that the :class:`FoundPokemon` can go through.
     stats: dict
         A dictionary containing the :class:`FoundPokemon`'s statistics.
         Involves the calculations for IVs, EVs, and level.
     """
+    __slots__ = ('id', 'num', 'name', 'form_id', 'ball', 'exp', 'item', 'party_position', 'owner', 'original_owner',
+                 'moves', 'hp_iv', 'attack_iv', 'defense_iv', 'sp_attack_iv', 'sp_defense_iv', 'speed_iv', 'hp_ev',
+                 'attack_ev', 'defense_ev', 'sp_attack_ev', 'sp_defense_ev', 'speed_ev', 'nature_mod', 'level')
+
+    def __init__(self, ctx, rec):
+        Record.__init__(self, ctx, rec)
+        self.species = ctx.bot.catalog.get_pokemon(self.num, self.form_id)
+
     @classmethod
     async def from_num(cls, ctx, num: int, form_id=0):
         """Constructs a list of :class:`FoundPokemon` using a given num.
@@ -519,22 +623,8 @@ class FoundPokemon(Pokemon):
         List[:class:`FoundPokemon`]:
             A list of constructed :class:`FoundPokemon` objects.
         """
-        try:
-            query = ctx._foundpokemon_from_num
-        except AttributeError:
-            query = ctx._foundpokemon_from_num = await ctx.con.prepare("""
-                SELECT *, (SELECT ARRAY(SELECT color FROM types WHERE types.name = ANY(types.name))) AS colors
-                FROM found WHERE num=$1 ORDER BY party_position, num, form_id
-                """)
-
-        mon_data = await query.fetch(num)
-        found_list = []
-        for record in mon_data:
-            c = cls(ctx, record)
-            await c.assign_extra_data()
-            found_list.append(c)
-
-        return found_list
+        mon_data = await ctx.bot.statements.fetch(ctx.con, 'found_from_num', num)
+        return [cls.from_record(ctx, record) for record in mon_data]
 
     @classmethod
     async def from_id(cls, ctx, found_id: int):
@@ -552,59 +642,45 @@ class FoundPokemon(Pokemon):
         :class:`FoundPokemon`:
             A constructed :class:`FoundPokemon` object.
         """
-        try:
-            query = ctx._found_from_id
-        except AttributeError:
-            query = ctx._found_from_id = await ctx.con.prepare("""
-                SELECT * FROM found WHERE id=$1 ORDER BY party_position ASC, num, form_id
-            """)
+        found_data = await ctx.bot.statements.fetchrow(ctx.con, 'found_from_id', found_id)
+        return cls.from_record(ctx, found_data)
 
-        found_data = await query.fetchrow(found_id)
-        c = cls(ctx, found_data)
-        await c.assign_extra_data()
+    @classmethod
+    def from_record(cls, ctx, record):
+        """Constructs a :class:`FoundPokemon` from a `found` record without querying the DB.
 
-        return c
+        Parameters
+        ----------
+        ctx: discord.commands.Context
+            The ctx to use when accessing the catalog.
+        record: asyncpg.Record
+            A `found` row.
 
-    async def assign_extra_data(self):
-        try:
-            self.ctx._nature_query
-        except AttributeError:
-            self.ctx._nature_query = await self.ctx.con.prepare("""
-                SELECT * FROM natures WHERE mod=$1
-                """)
-        base = await Pokemon.from_num(self.ctx, self.num, form_id=self.form_id)
-        self.__dict__.update(base.__dict__)
-        self.nature = await self.ctx._nature_query.fetchrow(self.personality % 25)
-        self.shiny = await self.is_shiny()
-        self.evolution_info = await self.get_evolution_info()
-        super().assign_extra_data()
+        Returns
+        -------
+        :class:`FoundPokemon`:
+            A constructed :class:`FoundPokemon` object.
+        """
+        return cls(ctx, record)
+
+    @property
+    def nature(self):
+        return self.ctx.bot.catalog.get_nature(self.nature_mod)
+
+    @property
+    def evolution_info(self):
+        return self.ctx.bot.catalog.evolution_graph.successors(self.num)
 
     @property
     def display_name(self):
-        if self.form is not None:
-            name = f"{self.form} {self.base_name}"
-        else:
-            name = self.base_name
+        name = self.species.display_name
         if self.name is not None:
             name = f"{self.name} ({name})"
         return name
 
-    @property
-    def level(self):
-        return level_from_xp(self.exp)
-
     async def transfer_ownership(self, new_trainer: typing.Union['Trainer', None]):
-        try:
-            query = self.ctx._transfer_ownership
-        except AttributeError:
-            query = self.ctx._transfer_ownership = await self.ctx.con.prepare("""
-                UPDATE found SET owner=$1, party_position=NULL WHERE id=$2 AND owner=$3
-            """)
-
-        if new_trainer is None:
-            await query.fetch(None, self.id, self.owner)
-        else:
-            await query.fetch(new_trainer.user_id, self.id, self.owner)
+        new_owner = None if new_trainer is None else new_trainer.user_id
+        await self.ctx.bot.statements.execute(self.ctx.con, 'found_transfer_ownership', new_owner, self.id, self.owner)
 
     async def add_experience(self, amount: int):
         """Adds experience to the :class:`FoundPokemon`.
@@ -623,20 +699,15 @@ class FoundPokemon(Pokemon):
             This will either be the current :class:`FoundPokemon`, or the
             evolved :class:`FoundPokemon`.
         """
-        try:
-            query = self.ctx._add_experience
-        except AttributeError:
-            query = self.ctx._add_experience = await self.ctx.con.prepare("""
-                UPDATE found SET exp=exp+$1, num=$2 WHERE id=$3
-                """)
+        statements = self.ctx.bot.statements
         evolved = await self.check_evolve()
         if evolved:
-            await query.fetch(amount, evolved, self.id)
+            await statements.execute(self.ctx.con, 'found_add_experience', amount, evolved.num, self.id)
             return await FoundPokemon.from_id(self.ctx, self.id)
         else:
-            await query.fetch(amount, self.num, self.id)
+            self.exp, self.level = await statements.fetchrow(self.ctx.con, 'found_add_experience',
+                                                             amount, self.num, self.id)
 
-        self.exp += amount
         return self
 
     async def check_evolve(self, trade_for: list=[], trading: bool=False):
@@ -651,40 +722,12 @@ class FoundPokemon(Pokemon):
 
         Returns
         -------
-        Union[int, None]:
+        Union[:class:`Pokemon`, None]:
             Will return the evolved Pokemon if the Pokemon can evolve,
             or returns None if the Pokemon cannot evolve.
         """
-        evo_info = self.evolution_info
-        to_evolve = None
-        current_xp = self.exp
-        for record in evo_info:
-            if record['next'] is None:
-                continue
-            xp_to_evolve = xp_to_level(record['level'])
-
-            if record['level'] == 1 or record['level'] == 100:
-                if record['trade_for'] is not None and record['trade'] and trading:
-                    if record['trade_for'] in [t['num'] for t in trade_for]:
-                        to_evolve = record['next']
-                        break
-                elif record['trade'] == trading:
-                    to_evolve = record['next']
-                    break
-                elif record['item'] == self.item:
-                    to_evolve = record['next']
-                    break
-            else:
-                if record['trade_for'] is not None and record['trade'] and trading and current_xp >= xp_to_evolve:
-                    if record['trade_for'] in [t['num'] for t in trade_for]:
-                        to_evolve = record['next']
-                        break
-                elif record['trade'] == trading and current_xp >= xp_to_evolve:
-                    to_evolve = record['next']
-                    break
-                elif record['item'] == self.item and current_xp >= xp_to_evolve:
-                    to_evolve = record['next']
-                    break
+        to_evolve = self.ctx.bot.catalog.evolution_graph.get_evolution(
+            self.num, self.exp, item=self.item, trading=trading, trade_for=[t.num for t in trade_for])
 
         if to_evolve is None:
             return
@@ -704,46 +747,14 @@ class FoundPokemon(Pokemon):
         :class:`FoundPokemon`:
             The evolved :class:`FoundPokemon`.
         """
-        try:
-            query = self.ctx._do_evolve
-        except AttributeError:
-            query = self.ctx._do_evolve = await self.ctx.con.prepare("""
-                UPDATE found SET num=$1 WHERE id=$2
-                """)
-
-        await query.fetch(evolve_to.num, self.id)
+        await self.ctx.bot.statements.execute(self.ctx.con, 'found_evolve', evolve_to.num, self.id)
 
         return await FoundPokemon.from_id(self.ctx, self.id)
 
-    async def get_evolution_info(self):
-        try:
-            query = self.ctx._evo_info
-        except AttributeError:
-            query = self.ctx._evo_info = await self.ctx.con.prepare("""
-                SELECT * FROM evolutions WHERE num=$1
-            """)
-
-        return await query.fetch(self.num)
-
     @property
     def stats(self):
-        stat_dict = {}
-        for stat in ['base_hp', 'base_attack', 'base_defense',
-                     'base_sp_attack', 'base_sp_defense', 'base_speed']:
-            stat = stat.replace('base_', '')
-            base = math.floor((((2 * getattr(self, f'base_{stat}') + getattr(self, f'{stat}_iv') +
-                                getattr(self, f'{stat}_ev') / 4)) * self.level) / 100) + 5
-            if stat == 'hp':
-                final = base + self.level + 5
-            elif self.nature['increase'] == stat:
-                final = base * 1.1
-            elif self.nature['decrease'] == stat:
-                final = base * 0.9
-            else:
-                final = base
-            stat_dict[stat] = math.floor(final)
-
-        return stat_dict
+        return stats.calculate_stats(stats.get_base(self), stats.get_ivs(self), stats.get_evs(self), self.level,
+                                     stats.nature_multipliers(self.nature))
 
     async def update_ev(self, stat: str, value: int, add=True):
         if not stat.endswith('_ev'):
@@ -781,12 +792,11 @@ class FoundPokemon(Pokemon):
             number of the :class:`Pokemon` to evolve to.
         """
         evolved = None
-        yield_from_info = await self.ctx.con.fetchrow("""
-            SELECT * FROM pokemon WHERE num=$1
-            """, yield_from['num'])
-        for key, val in yield_from_info.items():
+        yield_from_info = self.ctx.bot.catalog.get_pokemon(yield_from.num, yield_from.form_id)
+        for key in yield_from_info.COLUMNS:
             if not key.endswith('_yield'):
                 continue
+            val = getattr(yield_from_info, key)
             key = key.replace('_yield', '')
             if key == 'xp':
                 wild_mod = 1 if wild else 1.5
@@ -809,18 +819,11 @@ class FoundPokemon(Pokemon):
             If this name is the base_name of the :class:`Pokemon`,
             this will reset the custom name to `None`.
         """
-        try:
-            query = self.ctx._set_name_query
-        except AttributeError:
-            query = self.ctx._set_name_query = await self.ctx.con.prepare("""
-                UPDATE found SET name=$1 WHERE id=$2
-                """)
-
         if name.lower() == self.base_name.lower():
-            await query.fetch(None, self.id)
+            await self.ctx.bot.statements.execute(self.ctx.con, 'found_set_name', None, self.id)
             self.name = self.base_name
         else:
-            await query.fetch(name, self.id)
+            await self.ctx.bot.statements.execute(self.ctx.con, 'found_set_name', name, self.id)
             self.name = name
 
     async def set_party_position(self, position: typing.Union[int, None]):
@@ -832,14 +835,7 @@ class FoundPokemon(Pokemon):
             The party position to set to. `None` removes
             the :class:`FoundPokemon` from the party.
         """
-        try:
-            query = self.ctx._set_party_pos
-        except AttributeError:
-            query = self.ctx._set_party_pos = await self.ctx.con.prepare("""
-                UPDATE found SET party_position=$1 WHERE id=$2
-                """)
-
-        await query.fetch(position, self.id)
+        await self.ctx.bot.statements.execute(self.ctx.con, 'found_set_party_position', position, self.id)
         self.party_position = position
 
     def __repr__(self):
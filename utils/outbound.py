@@ -0,0 +1,172 @@
+from collections import deque
+import asyncio
+import time
+
+EDIT = 'edit'
+DELETE = 'delete'
+REACT = 'react'
+CLEAR_REACTIONS = 'clear_reactions'
+
+
+def _retrieve(future):
+    # Callers usually don't wait on their actions, so failures must not be reported as unretrieved.
+    if not future.cancelled():
+        future.exception()
+
+
+class _Action:
+    __slots__ = ('kind', 'fields', 'future', 'queued_at')
+
+    def __init__(self, kind, fields, future):
+        self.kind = kind
+        self.fields = fields
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class OutboundQueue:
+    """Sends the edits, reactions and deletes of messages in the background.
+
+    Every message has its own queue, which is worked through in order
+    by a task that only exists while the queue is not empty, so callers
+    don't wait on Discord unless they await the returned future.
+
+    Pending actions are merged where the result would be the same:
+
+    - An edit queued right after another pending edit is merged into it,
+      so only the latest state is sent.
+    - A delete drops every pending action on its message.
+    - Clearing reactions drops the pending reactions before it.
+
+    Reactions added together are sent concurrently. discord.py already
+    waits on the rate limit bucket of each request, which keeps them
+    within the limits while the requests overlap.
+
+    Parameters
+    ----------
+    loop: asyncio.AbstractEventLoop
+        The loop to run the queues on.
+
+    Attributes
+    ----------
+    sent: int
+        The amount of actions sent.
+    failed: int
+        The amount of actions that raised, e.g. because the message was deleted.
+    merged: int
+        The amount of edits merged into a pending edit.
+    dropped: int
+        The amount of actions dropped by a later delete or clear.
+    total_latency: float
+        The total seconds from queueing to finishing sent actions.
+    max_latency: float
+        The longest an action took from queueing to finishing in seconds.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.sent = 0
+        self.failed = 0
+        self.merged = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._queues = {}
+
+    def __len__(self):
+        return sum(map(len, self._queues.values()))
+
+    @property
+    def active(self):
+        """The amount of messages with pending actions."""
+        return len(self._queues)
+
+    @property
+    def average_latency(self):
+        finished = self.sent + self.failed
+        return self.total_latency / finished if finished else 0.0
+
+    def edit(self, message, **fields):
+        """Queues an edit of a message, taking the same arguments as :meth:`discord.Message.edit`.
+
+        Returns
+        -------
+        asyncio.Future:
+            Done once the message is edited, or once the edit is dropped.
+        """
+        actions = self._queues.get(message.id)
+        if actions and actions[-1].kind == EDIT:
+            self.merged += 1
+            actions[-1].fields.update(fields)
+            return actions[-1].future
+        return self._queue(message, EDIT, fields)
+
+    def add_reactions(self, message, emojis):
+        """Queues adding reactions to a message."""
+        return self._queue(message, REACT, tuple(emojis))
+
+    def clear_reactions(self, message):
+        """Queues removing every reaction from a message."""
+        actions = self._queues.get(message.id)
+        if actions:
+            self._drop(actions, lambda action: action.kind == REACT)
+        return self._queue(message, CLEAR_REACTIONS, None)
+
+    def delete(self, message):
+        """Queues deleting a message."""
+        actions = self._queues.get(message.id)
+        if actions:
+            self._drop(actions, lambda action: True)
+        return self._queue(message, DELETE, None)
+
+    def _drop(self, actions, predicate):
+        kept = [action for action in actions if not predicate(action)]
+        for action in actions:
+            if predicate(action):
+                self.dropped += 1
+                if not action.future.done():
+                    action.future.set_result(None)
+        actions.clear()
+        actions.extend(kept)
+
+    def _queue(self, message, kind, fields):
+        action = _Action(kind, fields, self.loop.create_future())
+        action.future.add_done_callback(_retrieve)
+        actions = self._queues.get(message.id)
+        if actions is None:
+            actions = self._queues[message.id] = deque()
+            self.loop.create_task(self._run(message, actions))
+        actions.append(action)
+        return action.future
+
+    async def _run(self, message, actions):
+        try:
+            while actions:
+                action = actions.popleft()
+                try:
+                    result = await self._send(message, action)
+                except Exception as e:
+                    self.failed += 1
+                    if not action.future.done():
+                        action.future.set_exception(e)
+                else:
+                    self.sent += 1
+                    if not action.future.done():
+                        action.future.set_result(result)
+                latency = time.perf_counter() - action.queued_at
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+        finally:
+            del self._queues[message.id]
+
+    async def _send(self, message, action):
+        if action.kind == EDIT:
+            return await message.edit(**action.fields)
+        elif action.kind == DELETE:
+            return await message.delete()
+        elif action.kind == CLEAR_REACTIONS:
+            return await message.clear_reactions()
+        results = await asyncio.gather(*(message.add_reaction(emoji) for emoji in action.fields),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
@@ -0,0 +1,179 @@
+import asyncio
+
+
+class PageSource:
+    """Supplies the entries of a menu one page at a time.
+
+    Subclasses implement :meth:`get_page`. The menu only shows the
+    entries returned by :meth:`format`, while :meth:`display` is shown
+    for selected entries and :meth:`value` is what the menu returns.
+
+    Attributes
+    ----------
+    per_page: int
+        The maximum amount of entries on a page.
+    total: Optional[int]
+        The amount of entries, or `None` if it is not known.
+    """
+    per_page = 10
+    total = None
+
+    async def get_page(self, page: int):
+        """Returns the entries on a page.
+
+        Parameters
+        ----------
+        page: int
+            The index of the page, starting at 0.
+
+        Returns
+        -------
+        list:
+            The entries on the page, empty if the page does not exist.
+        """
+        raise NotImplementedError
+
+    def format(self, entry):
+        """Returns the line that an entry is listed as."""
+        return str(entry)
+
+    def display(self, entry):
+        """Returns how a selected entry is shown."""
+        return self.format(entry)
+
+    def value(self, entry):
+        """Returns what the menu returns for a selected entry."""
+        return entry
+
+    async def close(self):
+        """Stops any work done in the background for the menu."""
+
+
+class ListPageSource(PageSource):
+    """Pages of options that are all known up front.
+
+    Parameters
+    ----------
+    options: Sequence[str]
+        The lines to list.
+    Optional[per_page: int]
+        The maximum amount of options on a page.
+    Optional[display: Sequence]
+        What is shown for each selected option, the options themselves if `None`.
+    Optional[return_from: Sequence]
+        What is returned for each selected option, the options themselves if `None`.
+
+    Raises
+    ------
+    ValueError
+        `display` or `return_from` does not have the same length as `options`.
+    """
+    def __init__(self, options, *, per_page=10, display=None, return_from=None):
+        if return_from is None:
+            return_from = options
+        elif len(return_from) != len(options):
+            raise ValueError('return_from length must match that of options')
+        if display is None:
+            display = options
+        elif len(display) != len(options):
+            raise ValueError('display length must match that of options')
+        self.options = options
+        self.per_page = per_page
+        self.total = len(options)
+        self._display = display
+        self._return_from = return_from
+
+    async def get_page(self, page: int):
+        start = page * self.per_page
+        return list(range(start, min(start + self.per_page, self.total)))
+
+    def format(self, entry):
+        return self.options[entry]
+
+    def display(self, entry):
+        return self._display[entry]
+
+    def value(self, entry):
+        return self._return_from[entry]
+
+
+class KeysetPageSource(PageSource):
+    """Pages of rows read from the DB as they are needed.
+
+    Each page is read with keyset pagination: the statement is passed
+    the key of the last row on the previous page, so reading a page
+    costs the same no matter how far into the rows it is. Read pages are
+    kept, and the page after the one last returned is read in the
+    background so that going forward does not wait on the DB.
+
+    Every read acquires its own connection from the pool and releases it
+    right away. Callers should release their own connection before the
+    menu starts, so that no connection is held while the menu waits on
+    its user.
+
+    Parameters
+    ----------
+    bot: discord.ext.commands.Bot
+        The bot with the pool and :class:`utils.statements.StatementRegistry` to read with.
+    statement: str
+        The name of the statement to read with. It is passed `args`, then
+        the key of the last row on the previous page, then the maximum
+        amount of rows to return, and returns rows ordered by their key.
+    args: tuple
+        The first arguments of the statement.
+    key: Callable[[asyncpg.Record], tuple]
+        Returns the key of a row.
+    start: tuple
+        A key that is before the key of every row.
+    formatter: Callable[[asyncpg.Record], str]
+        Returns the line that a row is listed as.
+    Optional[per_page: int]
+        The maximum amount of rows on a page.
+    Optional[total: int]
+        The amount of rows, if it is known.
+    """
+    def __init__(self, bot, statement, args, *, key, start, formatter, per_page=10, total=None):
+        self.bot = bot
+        self.statement = statement
+        self.args = tuple(args)
+        self.key = key
+        self.formatter = formatter
+        self.per_page = per_page
+        self.total = total
+        self._pages = []
+        self._next_key = tuple(start)
+        self._exhausted = False
+        self._lock = asyncio.Lock()
+        self._prefetch = None
+
+    async def _read_through(self, page):
+        async with self._lock:
+            while len(self._pages) <= page and not self._exhausted:
+                async with self.bot.db_pool.acquire() as con:
+                    rows = await self.bot.statements.fetch(con, self.statement, *self.args, *self._next_key,
+                                                           self.per_page)
+                if len(rows) < self.per_page:
+                    self._exhausted = True
+                if rows:
+                    self._pages.append(rows)
+                    self._next_key = tuple(self.key(rows[-1]))
+
+    async def get_page(self, page: int):
+        if page < 0:
+            return []
+        await self._read_through(page)
+        if not self._exhausted and (self._prefetch is None or self._prefetch.done()):
+            self._prefetch = asyncio.ensure_future(self._read_through(page + 1))
+        return self._pages[page] if page < len(self._pages) else []
+
+    def format(self, entry):
+        return self.formatter(entry)
+
+    async def close(self):
+        if self._prefetch is not None and not self._prefetch.done():
+            self._prefetch.cancel()
+            try:
+                await self._prefetch
+            except asyncio.CancelledError:
+                pass
+        self._prefetch = None
@@ -0,0 +1,238 @@
+import re
+
+from utils.errors import InvalidQuery
+from utils.stats import STATS
+
+LEVEL_SQL = 'f.level'
+SHINY_SQL = 'f.shiny'
+IVS_SQL = '(' + ' + '.join(f'f.{stat}_iv' for stat in STATS) + ')'
+EVS_SQL = '(' + ' + '.join(f'f.{stat}_ev' for stat in STATS) + ')'
+
+
+def stat_sql(stat):
+    """Returns the SQL for a stat, calculated exactly like :func:`utils.stats.calculate_stats`."""
+    base = f'(floor(((2 * p.base_{stat} + f.{stat}_iv + f.{stat}_ev / 4::float8) * {LEVEL_SQL}) / 100) + 5)'
+    if stat == 'hp':
+        return f'({base} + {LEVEL_SQL} + 5)'
+    return (f"floor({base} * (CASE WHEN n.increase = '{stat}' THEN 1.1::float8 "
+            f"WHEN n.decrease = '{stat}' THEN 0.9::float8 ELSE 1::float8 END))")
+
+
+FLAGS = {
+    'shiny': SHINY_SQL,
+    'legendary': 'p.legendary',
+    'mythical': 'p.mythical',
+    'party': 'f.party_position IS NOT NULL'
+}
+NUMERIC = {
+    'level': LEVEL_SQL,
+    'lvl': LEVEL_SQL,
+    'exp': 'f.exp',
+    'num': 'f.num',
+    'gen': 'p.generation',
+    'generation': 'p.generation',
+    'ivs': IVS_SQL,
+    'iv': IVS_SQL,
+    'evs': EVS_SQL,
+    'ev': EVS_SQL,
+    **{stat: stat_sql(stat) for stat in STATS}
+}
+TEXT = ('type', 'nature', 'item')
+COMPARATORS = {'<': '<', '<=': '<=', '>': '>', '>=': '>=', '=': '=', '==': '=', ':': '=', '!=': '<>'}
+TOKEN = re.compile(r'''\s*(?:
+    (?P<paren>[()])
+    |(?P<key>[a-z_]+)\s*(?P<sign><=|>=|!=|==|<|>|=|:)\s*(?P<value>"[^"]*"|[^\s()]+)
+    |(?P<word>[a-z_]+|&&?|\|\|?|!)
+)''', re.I | re.X)
+FILTER_KEY = re.compile(r'([a-z_]+)\s*:', re.I)
+AND = ('and', '&', '&&')
+OR = ('or', '|', '||')
+NOT = ('not', '!')
+
+
+def is_search(query: str):
+    """Returns whether a pc info query should be treated as a search instead of a name.
+
+    `key:value` is only a search if `key` is a known filter, since names like `Type: Null` contain `:`.
+    """
+    if any(c in query for c in '<>='):
+        return True
+    if any(key.lower() in NUMERIC or key.lower() in TEXT for key in FILTER_KEY.findall(query)):
+        return True
+    query = query.strip()
+    if query.startswith('!'):  # Negation, which is tokenized on its own like in `!shiny`.
+        return True
+    first = query.split(maxsplit=1)[0].lower() if query else ''
+    return first in FLAGS or first in NOT
+
+
+def tokenize(query: str):
+    tokens = []
+    pos = 0
+    query = query.strip()
+    while pos < len(query):
+        match = TOKEN.match(query, pos)
+        if match is None or match.end() == pos:
+            raise InvalidQuery(f'Unexpected `{query[pos:].strip()}`.')
+        tokens.append(match)
+        pos = match.end()
+    return tokens
+
+
+class PCSearch:
+    """A search over the `found` table compiled to parameterized SQL.
+
+    Searches combine predicates with `and`, `or`, `not` and parentheses.
+    Adjacent predicates are combined with `and`.
+
+    Flags: `shiny`, `legendary`, `mythical` and `party`.
+
+    Comparisons with `<`, `<=`, `>`, `>=`, `=`, `!=` or `:` on
+    `level`, `exp`, `num`, `gen`, `ivs`, `evs` and the stats
+    `hp`, `attack`, `defense`, `sp_attack`, `sp_defense` and `speed`.
+    `key:low-high` matches an inclusive range.
+
+    Text matches with `:` on `type`, `nature` and `item`.
+    `item:none` and `item:any` match Pokemon without or with an item.
+
+    e.g. `shiny or (legendary and level:30-50) and attack>120`
+
+    Parameters
+    ----------
+    query: str
+        The search to compile.
+    catalog: :class:`utils.catalog.Catalog`
+        The catalog used to validate type and nature names.
+    first_param: Optional[int]
+        The number of the first placeholder used by the search.
+
+    Attributes
+    ----------
+    sql: str
+        The compiled SQL condition.
+    params: list
+        The values for the placeholders in :attr:`sql`.
+
+    Raises
+    ------
+    InvalidQuery
+        The query could not be parsed.
+    """
+    def __init__(self, query: str, catalog, first_param=1):
+        self.catalog = catalog
+        self.params = []
+        self._first_param = first_param
+        self._tokens = tokenize(query)
+        self._pos = 0
+        if not self._tokens:
+            raise InvalidQuery('The query is empty.')
+        self.sql = self._parse_or()
+        if self._pos != len(self._tokens):
+            raise InvalidQuery(f'Unexpected `{self._tokens[self._pos].group().strip()}`.')
+
+    def _param(self, value):
+        self.params.append(value)
+        return f'${self._first_param + len(self.params) - 1}'
+
+    def _peek_word(self):
+        if self._pos < len(self._tokens):
+            token = self._tokens[self._pos]
+            return (token.group('word') or token.group('paren') or '').lower()
+
+    def _parse_or(self):
+        parts = [self._parse_and()]
+        while self._peek_word() in OR:
+            self._pos += 1
+            parts.append(self._parse_and())
+        return parts[0] if len(parts) == 1 else '(' + ' OR '.join(parts) + ')'
+
+    def _parse_and(self):
+        parts = [self._parse_not()]
+        while self._pos < len(self._tokens) and self._peek_word() not in (*OR, ')'):
+            if self._peek_word() in AND:
+                self._pos += 1
+            parts.append(self._parse_not())
+        return parts[0] if len(parts) == 1 else '(' + ' AND '.join(parts) + ')'
+
+    def _parse_not(self):
+        if self._peek_word() in NOT:
+            self._pos += 1
+            return f'(NOT {self._parse_not()})'
+        return self._parse_atom()
+
+    def _parse_atom(self):
+        if self._pos >= len(self._tokens):
+            raise InvalidQuery('The query ended unexpectedly.')
+        token = self._tokens[self._pos]
+        self._pos += 1
+        if token.group('paren') == '(':
+            sql = self._parse_or()
+            if self._peek_word() != ')':
+                raise InvalidQuery('Missing `)`.')
+            self._pos += 1
+            return sql
+        if token.group('key'):
+            value = token.group('value').strip('"')
+            return self._compile_comparison(token.group('key').lower(), token.group('sign'), value)
+        word = (token.group('word') or token.group('paren')).lower()
+        try:
+            return f'({FLAGS[word]})'
+        except KeyError:
+            raise InvalidQuery(f'Unknown filter `{word}`. Valid filters are: '
+                               f'`{"`, `".join((*FLAGS, *TEXT, *NUMERIC))}`') from None
+
+    def _compile_comparison(self, key, sign, value):
+        if key in NUMERIC:
+            column = NUMERIC[key]
+            low, sep, high = value.partition('-')
+            if sep and sign == ':':
+                if not (low.isdigit() and high.isdigit()):
+                    raise InvalidQuery(f'`{key}` ranges must be numbers like `{key}:10-20`.')
+                return f'({column} BETWEEN {self._param(int(low))} AND {self._param(int(high))})'
+            if not value.isdigit():
+                raise InvalidQuery(f'`{key}` must be compared to a number.')
+            return f'({column} {COMPARATORS[sign]} {self._param(int(value))})'
+        if key not in TEXT:
+            raise InvalidQuery(f'Unknown filter `{key}`.')
+        if sign not in (':', '=', '==', '!='):
+            raise InvalidQuery(f'`{key}` can only be compared with `:`.')
+        negate = 'NOT ' if sign == '!=' else ''
+        if key == 'type':
+            types = {name.lower(): name for name in self.catalog.types}
+            try:
+                name = types[value.lower()]
+            except KeyError:
+                raise InvalidQuery(f'Unknown type `{value}`.') from None
+            return f'({negate}{self._param(name)}::poketype = ANY(p.type))'
+        if key == 'nature':
+            natures = {nature['name'].lower(): nature['mod'] for nature in self.catalog.natures}
+            try:
+                mod = natures[value.lower()]
+            except KeyError:
+                raise InvalidQuery(f'Unknown nature `{value}`.') from None
+            return f'({negate}f.nature_mod = {self._param(mod)})'
+        if value.lower() in ('none', 'any'):
+            return f"(f.item IS {'NOT ' if (value.lower() == 'any') != bool(negate) else ''}NULL)"
+        return f'({negate}lower(f.item) = lower({self._param(value)}))'
+
+
+async def search_pokemon(ctx, owner_id: int, query: str):
+    """Returns the `found` records of an owner that match a :class:`PCSearch`.
+
+    Only the matching rows are fetched, ordered like the PC.
+    The records can be hydrated with :meth:`utils.orm.FoundPokemon.from_record`.
+
+    Raises
+    ------
+    InvalidQuery
+        The query could not be parsed.
+    """
+    search = PCSearch(query, ctx.bot.catalog, first_param=2)
+    return await ctx.con.fetch(f"""
+        SELECT f.*
+        FROM found f
+        JOIN pokemon p ON p.num = f.num AND p.form_id = f.form_id
+        JOIN natures n ON n.mod = f.nature_mod
+        WHERE f.owner = $1 AND {search.sql}
+        ORDER BY f.party_position, f.num, f.form_id, f.id
+        """, owner_id, *search.params)
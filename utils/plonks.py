@@ -0,0 +1,62 @@
+from collections import defaultdict
+import json
+
+from utils.listener import Listener
+
+
+class PlonkCache(Listener):
+    """An in-memory copy of the `plonks` table.
+
+    The table is loaded once by :meth:`start`, which also listens for
+    the NOTIFY sent by the `plonks_notify` trigger, so plonks made by
+    other processes sharing the DB are applied here too. Checking a
+    message never queries the DB. See :class:`utils.listener.Listener`
+    for how the listening connection is kept alive.
+
+    Parameters
+    ----------
+    dsn: str
+        The DSN to connect to the DB with.
+    Optional[retry_interval: float]
+        The maximum seconds between attempts to reconnect.
+    """
+    channel = 'plonks'
+
+    def __init__(self, dsn, *, retry_interval=60):
+        super().__init__(dsn, retry_interval=retry_interval)
+        self._plonks = defaultdict(set)
+
+    def __len__(self):
+        return sum(map(len, self._plonks.values()))
+
+    async def load(self, con):
+        return await con.fetch('SELECT guild_id, user_id FROM plonks')
+
+    def reset(self, records):
+        plonks = defaultdict(set)
+        for rec in records:
+            plonks[rec['guild_id']].add(rec['user_id'])
+        self._plonks = plonks
+
+    def apply(self, pid, payload):
+        change = json.loads(payload)
+        if change['op'] == 'INSERT':
+            self.add(change['guild_id'], change['user_id'])
+        else:
+            self.discard(change['guild_id'], change['user_id'])
+
+    def is_plonked(self, guild_id: int, user_id: int):
+        """Returns whether or not a user is plonked in a guild."""
+        users = self._plonks.get(guild_id)
+        return users is not None and user_id in users
+
+    def add(self, guild_id: int, user_id: int):
+        self._plonks[guild_id].add(user_id)
+
+    def discard(self, guild_id: int, user_id: int):
+        users = self._plonks.get(guild_id)
+        if users is None:
+            return
+        users.discard(user_id)
+        if not users:
+            del self._plonks[guild_id]
@@ -0,0 +1,173 @@
+import itertools
+import asyncio
+import heapq
+
+
+class _Wait:
+    __slots__ = ('future', 'check', 'index', 'key')
+
+    def __init__(self, future, check, index, key):
+        self.future = future
+        self.check = check
+        self.index = index
+        self.key = key
+
+
+class InteractionRouter:
+    """Routes reactions and messages to the menus waiting on them.
+
+    This replaces :meth:`discord.Client.wait_for`, which tests every
+    event against every pending check. Reaction waits are indexed by
+    message ID and message waits by channel and user ID, so an event is
+    only tested against the waits for its own message or author.
+
+    Timeouts share one heap of deadlines and one scheduled callback for
+    the earliest of them, instead of a timer per wait.
+
+    The bot passes every event to :meth:`dispatch_reaction` and
+    :meth:`dispatch_message`.
+
+    Parameters
+    ----------
+    loop: asyncio.AbstractEventLoop
+        The loop to create futures and timers on.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self._reactions = {}
+        self._messages = {}
+        self._deadlines = []
+        self._order = itertools.count()
+        self._timer = None
+        self._timer_deadline = None
+
+    def __len__(self):
+        return sum(map(len, self._reactions.values())) + sum(map(len, self._messages.values()))
+
+    async def wait_for_reaction(self, message_id: int, *, user_id=None, emojis=None, check=None, timeout=None):
+        """Waits for a reaction to be added to a message.
+
+        Parameters
+        ----------
+        message_id: int
+            The ID of the message.
+        Optional[user_id: int]
+            The ID of the user to wait on, any user if `None`.
+        Optional[emojis: Sequence]
+            The emojis to wait for, any emoji if `None`.
+        Optional[check: Callable[[discord.Reaction, discord.User], bool]]
+            Any other condition for the reaction.
+        Optional[timeout: float]
+            The maximum seconds to wait, forever if `None`.
+
+        Returns
+        -------
+        Tuple[discord.Reaction, discord.User]:
+            The reaction and the user who added it.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            No reaction was added in time.
+        """
+        def matches(reaction, user):
+            return ((user_id is None or user.id == user_id) and
+                    (emojis is None or reaction.emoji in emojis) and
+                    (check is None or check(reaction, user)))
+
+        return await self._wait(self._reactions, message_id, matches, timeout)
+
+    async def wait_for_message(self, channel_id: int, user_id: int, *, check=None, timeout=None):
+        """Waits for a user to send a message in a channel.
+
+        Parameters
+        ----------
+        channel_id: int
+            The ID of the channel.
+        user_id: int
+            The ID of the author.
+        Optional[check: Callable[[discord.Message], bool]]
+            Any other condition for the message.
+        Optional[timeout: float]
+            The maximum seconds to wait, forever if `None`.
+
+        Returns
+        -------
+        discord.Message:
+            The message.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            No message was sent in time.
+        """
+        return await self._wait(self._messages, (channel_id, user_id), check, timeout)
+
+    def dispatch_reaction(self, reaction, user):
+        """Resolves the waits that a reaction matches."""
+        self._dispatch(self._reactions, reaction.message.id, (reaction, user))
+
+    def dispatch_message(self, message):
+        """Resolves the waits that a message matches."""
+        self._dispatch(self._messages, (message.channel.id, message.author.id), (message,))
+
+    async def _wait(self, index, key, check, timeout):
+        wait = _Wait(self.loop.create_future(), check, index, key)
+        index.setdefault(key, []).append(wait)
+        if timeout is not None:
+            self._schedule(self.loop.time() + timeout, wait)
+        try:
+            return await wait.future
+        finally:
+            self._discard(wait)
+
+    def _discard(self, wait):
+        waits = wait.index.get(wait.key)
+        if waits is None:
+            return
+        try:
+            waits.remove(wait)
+        except ValueError:
+            return
+        if not waits:
+            del wait.index[wait.key]
+
+    def _dispatch(self, index, key, args):
+        waits = index.get(key)
+        if not waits:
+            return
+        for wait in list(waits):
+            if wait.future.done():
+                continue
+            try:
+                matched = wait.check is None or wait.check(*args)
+            except Exception as e:
+                wait.future.set_exception(e)
+                continue
+            if matched:
+                wait.future.set_result(args[0] if len(args) == 1 else args)
+
+    def _schedule(self, deadline, wait):
+        heapq.heappush(self._deadlines, (deadline, next(self._order), wait))
+        if self._timer is None or deadline < self._timer_deadline:
+            self._reset_timer()
+
+    def _reset_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Waits that finished early are left in the heap until they reach the top.
+        while self._deadlines and self._deadlines[0][2].future.done():
+            heapq.heappop(self._deadlines)
+        if self._deadlines:
+            self._timer_deadline = self._deadlines[0][0]
+            self._timer = self.loop.call_at(self._timer_deadline, self._expire)
+
+    def _expire(self):
+        self._timer = None
+        now = self.loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, wait = heapq.heappop(self._deadlines)
+            if not wait.future.done():
+                wait.future.set_exception(asyncio.TimeoutError())
+        self._reset_timer()
@@ -0,0 +1,121 @@
+import random
+
+
+class WeightedSampler:
+    """Samples items by weight in constant time using Vose's alias method.
+
+    Parameters
+    ----------
+    items: Sequence[Any]
+        The items to sample from.
+    Optional[weights: Sequence[float]]
+        The relative weight of each item. Defaults to uniform weights.
+
+    Raises
+    ------
+    ValueError
+        The weights are negative, don't match the items or sum to zero.
+    """
+    def __init__(self, items, weights=None):
+        self.items = tuple(items)
+        if weights is None:
+            weights = [1] * len(self.items)
+        weights = list(weights)
+        if len(weights) != len(self.items):
+            raise ValueError('weights length must match that of items')
+        if any(w < 0 for w in weights):
+            raise ValueError('weights must not be negative')
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError('weights must not sum to zero')
+
+        count = len(weights)
+        scaled = [w * count / total for w in weights]
+        self._prob = [1.0] * count
+        self._alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, rand=random):
+        """Returns a random item using a single random draw."""
+        r = rand.random() * len(self._prob)
+        index = int(r)
+        if r - index >= self._prob[index]:
+            index = self._alias[index]
+        return self.items[index]
+
+
+class EncounterSampler:
+    """Samples wild Pokemon from the catalog with configurable rarity.
+
+    The weight of a :class:`utils.catalog.Species` is the product of every factor that
+    applies to it. A guild's weights override the global weights key by
+    key. Samplers are built lazily per guild and only rebuilt when
+    :meth:`configure` is called.
+
+    Weights are a dict with any of the following keys:
+
+    ``default``: float
+        The base weight of every row. Defaults to 1.
+    ``legendary``: float
+        The factor for legendary rows that are not mythical.
+    ``mythical``: float
+        The factor for mythical rows.
+    ``generations``: Dict[int, float]
+        The factor for rows per generation.
+    ``species``: Dict[int, float]
+        The factor for rows per num.
+
+    Parameters
+    ----------
+    catalog: :class:`utils.catalog.Catalog`
+        The catalog to sample :class:`utils.catalog.Species` from.
+    Optional[weights: dict]
+        The global weights.
+    Optional[guild_weights: Dict[int, dict]]
+        The weights per guild ID.
+    """
+    def __init__(self, catalog, weights=None, guild_weights=None):
+        self.catalog = catalog
+        self.configure(weights, guild_weights)
+
+    def configure(self, weights=None, guild_weights=None):
+        """Replaces the weights and discards every built sampler."""
+        self.weights = dict(weights or {})
+        self.guild_weights = {guild_id: dict(w) for guild_id, w in (guild_weights or {}).items()}
+        self._samplers = {}
+
+    def get_weight(self, mon, weights):
+        weight = weights.get('default', 1)
+        if mon.mythical:
+            weight *= weights.get('mythical', 1)
+        elif mon.legendary:
+            weight *= weights.get('legendary', 1)
+        weight *= weights.get('generations', {}).get(mon.generation, 1)
+        weight *= weights.get('species', {}).get(mon.num, 1)
+        return weight
+
+    def get_sampler(self, guild_id=None):
+        """Returns the :class:`WeightedSampler` for a guild ID, building it if needed."""
+        if guild_id not in self.guild_weights:
+            guild_id = None
+        try:
+            return self._samplers[guild_id]
+        except KeyError:
+            weights = {**self.weights, **self.guild_weights.get(guild_id, {})}
+            mons = self.catalog.pokemon
+            sampler = self._samplers[guild_id] = WeightedSampler(mons, [self.get_weight(m, weights) for m in mons])
+            return sampler
+
+    def sample(self, guild_id=None):
+        """Returns a random :class:`utils.catalog.Species` for a guild ID."""
+        return self.get_sampler(guild_id).sample()
@@ -0,0 +1,120 @@
+from collections import Counter, OrderedDict
+from functools import partial
+import unicodedata
+import asyncio
+import re
+
+from fuzzywuzzy import process
+
+
+def normalize(name: str):
+    """Returns a name lowercased, ASCII-folded and stripped of punctuation.
+
+    Parameters
+    ----------
+    name: str
+        The name to normalize.
+
+    Returns
+    -------
+    str:
+        The normalized name, e.g. `Nidoran♀` becomes `nidoran f`
+        and `Farfetch'd` becomes `farfetchd`.
+    """
+    name = name.replace('\N{FEMALE SIGN}', ' f').replace('\N{MALE SIGN}', ' m').replace("'", '')
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+
+def trigrams(name: str):
+    """Returns the set of padded character trigrams of a normalized name."""
+    padded = f'  {name} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """A prebuilt fuzzy search index over names.
+
+    Candidates are prefiltered by shared trigrams, so only a handful of
+    names are scored by fuzzywuzzy. Scoring runs in the default executor
+    so typos never block the event loop, and recent queries are kept in a
+    bounded LRU.
+
+    Parameters
+    ----------
+    entries: Iterable[Tuple[str, Any]]
+        Pairs of name and the value to return when that name matches.
+        A value can be given under several names to add aliases.
+    candidates: Optional[int]
+        The maximum amount of prefiltered names to score.
+    cache_size: Optional[int]
+        The maximum amount of recent queries to remember.
+    """
+    def __init__(self, entries, *, candidates=25, cache_size=512):
+        self._names = []
+        self._values = []
+        self._exact = {}
+        self._grams = {}
+        for name, value in entries:
+            key = normalize(name)
+            if not key or key in self._exact:
+                continue
+            self._exact[key] = value
+            index = len(self._names)
+            self._names.append(key)
+            self._values.append(value)
+            for gram in trigrams(key):
+                self._grams.setdefault(gram, []).append(index)
+        self.candidates = candidates
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._names)
+
+    def get_candidates(self, query: str):
+        """Returns the indexes of the names sharing the most trigrams with a normalized query."""
+        counts = Counter()
+        for gram in trigrams(query):
+            counts.update(self._grams.get(gram, ()))
+        if not counts:
+            return range(len(self._names))
+        return [index for index, _ in counts.most_common(self.candidates)]
+
+    def _score(self, query, candidates):
+        choices = {index: self._names[index] for index in candidates}
+        return process.extractOne(query, choices)
+
+    async def search(self, query: str, *, cutoff=70):
+        """Finds the closest match for a query.
+
+        Parameters
+        ----------
+        query: str
+            The name to search for.
+        Optional[cutoff: int]
+            The minimum score out of 100 for a match.
+
+        Returns
+        -------
+        Union[Tuple[Any, int], None]:
+            The value of the matched name and its score,
+            or `None` if nothing scored at least `cutoff`.
+        """
+        key = normalize(query)
+        try:
+            result = self._exact[key], 100
+        except KeyError:
+            try:
+                result = self._cache[key]
+                self._cache.move_to_end(key)
+            except KeyError:
+                loop = asyncio.get_event_loop()
+                match = await loop.run_in_executor(None, partial(self._score, key, self.get_candidates(key)))
+                result = None if match is None else (self._values[match[2]], match[1])
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        if result is None or result[1] < cutoff:
+            return None
+        return result
@@ -0,0 +1,214 @@
+from collections import Counter
+
+from utils.connection import LazyConnection
+
+STATEMENTS = {
+    'trainer_get': """
+        SELECT * FROM trainers WHERE user_id=$1
+        """,
+    'trainer_create': """
+        INSERT INTO trainers (user_id) VALUES ($1)
+        ON CONFLICT (user_id) DO NOTHING
+        RETURNING *
+        """,
+    'trainer_update_inventory': """
+        UPDATE trainers SET inventory = inventory_add(inventory, $2)
+        WHERE user_id = $1 AND inventory_add(inventory, $2) IS NOT NULL
+        RETURNING inventory
+        """,
+    # Releases Pokemon and credits their price in one statement, see Trainer.sell_pokemon
+    'trainer_sell': """
+        WITH sold AS (
+            UPDATE found f SET owner = NULL, party_position = NULL
+            FROM pokemon p
+            WHERE f.id = ANY($2::bigint[]) AND f.owner = $1 AND p.num = f.num AND p.form_id = f.form_id
+            RETURNING f.id, f.num,
+                      CASE WHEN f.shiny THEN 1000 ELSE 0 END +
+                      CASE WHEN p.mythical THEN 1000 WHEN p.legendary THEN 600 ELSE 100 END AS price
+        ), credit AS (
+            UPDATE trainers SET inventory = inventory_add(inventory, jsonb_build_object('money', (SELECT SUM(price) FROM sold)))
+            WHERE user_id = $1 AND EXISTS (SELECT FROM sold)
+            RETURNING inventory
+        )
+        SELECT COALESCE((SELECT array_agg(id ORDER BY num, id) FROM sold), '{}') AS ids,
+               COALESCE((SELECT array_agg(num ORDER BY num, id) FROM sold), '{}') AS nums,
+               COALESCE((SELECT SUM(price) FROM sold), 0)::bigint AS total,
+               (SELECT inventory FROM credit) AS inventory
+        """,
+    # Same as trainer_sell, for the non-shiny Pokemon beyond the first $2 of each num
+    # Party members are never sold but count towards the ones kept
+    'trainer_sell_duplicates': """
+        WITH ranked AS (
+            SELECT id, party_position,
+                   row_number() OVER (PARTITION BY num ORDER BY party_position IS NULL, exp DESC, id) AS rank
+            FROM found WHERE owner = $1 AND NOT shiny
+        ), sold AS (
+            UPDATE found f SET owner = NULL, party_position = NULL
+            FROM ranked r, pokemon p
+            WHERE f.id = r.id AND r.rank > $2 AND r.party_position IS NULL
+            AND f.owner = $1 AND p.num = f.num AND p.form_id = f.form_id
+            RETURNING f.id, f.num,
+                      CASE WHEN p.mythical THEN 1000 WHEN p.legendary THEN 600 ELSE 100 END AS price
+        ), credit AS (
+            UPDATE trainers SET inventory = inventory_add(inventory, jsonb_build_object('money', (SELECT SUM(price) FROM sold)))
+            WHERE user_id = $1 AND EXISTS (SELECT FROM sold)
+            RETURNING inventory
+        )
+        SELECT COALESCE((SELECT array_agg(id ORDER BY num, id) FROM sold), '{}') AS ids,
+               COALESCE((SELECT array_agg(num ORDER BY num, id) FROM sold), '{}') AS nums,
+               COALESCE((SELECT SUM(price) FROM sold), 0)::bigint AS total,
+               (SELECT inventory FROM credit) AS inventory
+        """,
+    'trainer_pc_counts': """
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE p.legendary AND NOT p.mythical) AS legendary,
+               COUNT(*) FILTER (WHERE p.mythical) AS mythical
+        FROM found f JOIN pokemon p ON p.num = f.num AND p.form_id = f.form_id
+        WHERE f.owner = $1
+        """,
+    # A page of the PC after the group ($2, $3, $4, $5, $6), at most $7 groups
+    # Pokemon are grouped by position, num, form_id, shiny and name, so party members, whose
+    # positions are unique, are listed individually and the rest are counted
+    # The key, GROUP BY and ORDER BY all follow found_owner_pc_groups_idx, so the groups are
+    # aggregated in index order and the scan stops once the page is full
+    'trainer_pc_page': """
+        SELECT NULLIF(COALESCE(f.party_position, 32767), 32767) AS party_position, f.num, f.form_id, f.shiny,
+               NULLIF(COALESCE(f.name, ''), '') AS name, COUNT(*) AS count,
+               COALESCE(f.party_position, 32767) AS position, COALESCE(f.name, '') AS name_key
+        FROM found f
+        WHERE f.owner = $1
+        AND (COALESCE(f.party_position, 32767), f.num, f.form_id, f.shiny, COALESCE(f.name, '')) > ($2, $3, $4, $5, $6)
+        GROUP BY COALESCE(f.party_position, 32767), f.num, f.form_id, f.shiny, COALESCE(f.name, '')
+        ORDER BY COALESCE(f.party_position, 32767), f.num, f.form_id, f.shiny, COALESCE(f.name, '')
+        LIMIT $7
+        """,
+    'trainer_seen_counts': """
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE p.legendary AND NOT p.mythical) AS legendary,
+               COUNT(*) FILTER (WHERE p.mythical) AS mythical
+        FROM seen s JOIN pokemon p ON p.num = s.num AND p.form_id = 0
+        WHERE s.user_id = $1
+        """,
+    'trainer_seen_page': """
+        SELECT num FROM seen WHERE user_id=$1 AND num > $2 ORDER BY num LIMIT $3
+        """,
+    'trainer_party': """
+        SELECT * FROM found WHERE owner=$1 AND party_position IS NOT NULL ORDER BY party_position
+        """,
+    'trainer_pokemon': """
+        SELECT * FROM found WHERE owner=$1 ORDER BY party_position, num, form_id, id
+        """,
+    'trainer_seen': """
+        SELECT * FROM seen WHERE user_id=$1 ORDER BY num
+        """,
+    'trainer_see': """
+        INSERT INTO seen (user_id, num) VALUES ($1, $2)
+        ON CONFLICT DO NOTHING
+        """,
+    'found_insert': """
+        INSERT INTO found (num, form_id, ball, exp, owner, original_owner, personality) VALUES ($1, $2, $3, $4, $5, $6, $7)
+        RETURNING id
+        """,
+    'found_from_num': """
+        SELECT * FROM found WHERE num=$1 ORDER BY party_position, num, form_id
+        """,
+    'found_from_id': """
+        SELECT * FROM found WHERE id=$1
+        """,
+    'found_transfer_ownership': """
+        UPDATE found SET owner=$1, party_position=NULL WHERE id=$2 AND owner=$3
+        """,
+    'found_add_experience': """
+        UPDATE found SET exp=exp+$1, num=$2 WHERE id=$3 RETURNING exp, level
+        """,
+    'found_evolve': """
+        UPDATE found SET num=$1 WHERE id=$2
+        """,
+    'found_set_name': """
+        UPDATE found SET name=$1 WHERE id=$2
+        """,
+    'found_set_party_position': """
+        UPDATE found SET party_position=$1 WHERE id=$2
+        """
+}
+
+
+class StatementRegistry:
+    """Named SQL statements run through each connection's statement cache.
+
+    Statements are run with the plain connection methods, so asyncpg
+    prepares each one the first time it is used on a connection and
+    reuses it from the connection's own statement cache afterwards.
+    Prepared statements are never kept here, since asyncpg invalidates
+    them once their connection is released back to the pool.
+
+    :meth:`register` is meant to be called from the pool's `init` hook,
+    so the uses of each new connection are counted from scratch.
+    Connections are keyed by their server PID, which stays the same
+    through :class:`asyncpg.pool.PoolConnectionProxy`.
+
+    Parameters
+    ----------
+    statements: Mapping[str, str]
+        The SQL of each statement, keyed by name.
+
+    Attributes
+    ----------
+    hits: collections.Counter
+        The amount of uses on a connection that already ran the statement, per name.
+    misses: collections.Counter
+        The amount of first uses on a connection, which prepare the statement, per name.
+    """
+    def __init__(self, statements):
+        self.statements = dict(statements)
+        self.hits = Counter()
+        self.misses = Counter()
+        self._used = {}
+        self._connections = {}
+
+    def register(self, con):
+        """Starts counting the uses of a new connection.
+
+        Connections that were closed by the pool are forgotten here,
+        since a new connection is always initialized after one is closed.
+
+        Parameters
+        ----------
+        con: asyncpg.connection.Connection
+            The new connection.
+        """
+        for pid, other in list(self._connections.items()):
+            if other.is_closed():
+                del self._connections[pid]
+                self._used.pop(pid, None)
+        pid = con.get_server_pid()
+        self._connections[pid] = con
+        self._used[pid] = set()
+
+    async def _run(self, con, name, method, args):
+        sql = self.statements[name]
+        if isinstance(con, LazyConnection):
+            con = await con.acquire()
+        used = self._used.setdefault(con.get_server_pid(), set())
+        if name in used:
+            self.hits[name] += 1
+        else:
+            self.misses[name] += 1
+            used.add(name)
+        return await getattr(con, method)(sql, *args)
+
+    async def fetch(self, con, name: str, *args):
+        """Runs a statement and returns a list of :class:`asyncpg.Record`."""
+        return await self._run(con, name, 'fetch', args)
+
+    async def fetchrow(self, con, name: str, *args):
+        """Runs a statement and returns the first :class:`asyncpg.Record`, or `None`."""
+        return await self._run(con, name, 'fetchrow', args)
+
+    async def fetchval(self, con, name: str, *args):
+        """Runs a statement and returns the first column of the first row, or `None`."""
+        return await self._run(con, name, 'fetchval', args)
+
+    async def execute(self, con, name: str, *args):
+        """Runs a statement and returns its status, e.g. `UPDATE 1`."""
+        return await self._run(con, name, 'execute', args)
@@ -0,0 +1,46 @@
+from operator import attrgetter
+import math
+
+STATS = ('hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed')
+
+get_base = attrgetter(*(f'base_{stat}' for stat in STATS))
+get_ivs = attrgetter(*(f'{stat}_iv' for stat in STATS))
+get_evs = attrgetter(*(f'{stat}_ev' for stat in STATS))
+
+
+def nature_multipliers(nature):
+    """Returns the multiplier of each stat in :data:`STATS` for a `natures` row."""
+    return tuple(1.1 if nature['increase'] == stat else 0.9 if nature['decrease'] == stat else 1.0
+                 for stat in STATS)
+
+
+def calculate_stats(base, ivs, evs, level: int, multipliers):
+    """Calculates the stats of a single Pokemon.
+
+    Parameters
+    ----------
+    base: Sequence[int]
+        The base stats, ordered like :data:`STATS`.
+    ivs: Sequence[int]
+        The IVs, ordered like :data:`STATS`.
+    evs: Sequence[int]
+        The EVs, ordered like :data:`STATS`.
+    level: int
+        The level of the Pokemon.
+    multipliers: Sequence[float]
+        The nature multipliers from :func:`nature_multipliers`.
+
+    Returns
+    -------
+    dict:
+        The final value of each stat.
+    """
+    stat_dict = {}
+    for stat, b, iv, ev, mult in zip(STATS, base, ivs, evs, multipliers):
+        value = math.floor(((2 * b + iv + ev / 4) * level) / 100) + 5
+        if stat == 'hp':
+            stat_dict[stat] = value + level + 5
+        else:
+            stat_dict[stat] = math.floor(value * mult)
+    return stat_dict
+
@@ -0,0 +1,80 @@
+from utils.errors import TradeError
+
+
+async def settle_trade(ctx, offers):
+    """Settles a trade in one transaction.
+
+    Every offered Pokemon is locked and checked to still belong to its
+    trainer, then all transfers and trade evolutions are applied by one
+    UPDATE and the new owners see what they received with one INSERT.
+    The amount of queries does not depend on the size of the trade, and
+    either everything is traded or nothing is.
+
+    Parameters
+    ----------
+    ctx: discord.commands.Context
+        The ctx used for connecting with the DB.
+    offers: Mapping[int, Tuple[int, Sequence[:class:`utils.orm.FoundPokemon`]]]
+        The user ID that receives each offer, keyed by the user ID that gives it.
+        Each Pokemon is traded for the Pokemon in the other offers.
+
+    Returns
+    -------
+    Dict[int, int]:
+        The num that each evolved Pokemon evolved into, keyed by `found.id`.
+
+    Raises
+    ------
+    TradeError
+        An offered Pokemon was offered twice or is no longer owned by its trainer.
+    """
+    owners = {}
+    for giver, (_, mons) in offers.items():
+        for mon in mons:
+            if mon.id in owners:
+                raise TradeError(f'{mon.display_name} was offered more than once.')
+            owners[mon.id] = giver
+    ids = list(owners)
+    if not ids:
+        return {}
+
+    graph = ctx.bot.catalog.evolution_graph
+    async with ctx.con.transaction():
+        records = await ctx.con.fetch("""
+            SELECT id, num, exp, item, owner FROM found WHERE id = ANY($1::bigint[]) ORDER BY id FOR UPDATE
+            """, ids)
+        records = {r['id']: r for r in records}
+        for found_id, giver in owners.items():
+            record = records.get(found_id)
+            if record is None or record['owner'] != giver:
+                raise TradeError(f'A Pokemon with ID {found_id} is no longer owned by its trainer.')
+
+        nums = {giver: [records[mon.id]['num'] for mon in mons] for giver, (_, mons) in offers.items()}
+        new_owners = []
+        new_nums = []
+        evolved = {}
+        for found_id in ids:
+            record = records[found_id]
+            giver = owners[found_id]
+            trade_for = [num for other, other_nums in nums.items() if other != giver for num in other_nums]
+            num = graph.get_evolution(record['num'], record['exp'], item=record['item'], trading=True,
+                                      trade_for=trade_for)
+            if num is None:
+                num = record['num']
+            else:
+                evolved[found_id] = num
+            new_owners.append(offers[giver][0])
+            new_nums.append(num)
+
+        await ctx.con.execute("""
+            UPDATE found f SET owner = t.owner, num = t.num, party_position = NULL
+            FROM unnest($1::bigint[], $2::bigint[], $3::smallint[]) t (id, owner, num)
+            WHERE f.id = t.id
+            """, ids, new_owners, new_nums)
+        seen = {(owner, num) for owner, num in zip(new_owners, new_nums)}
+        seen.update((offers[owners[i]][0], records[i]['num']) for i in ids)
+        await ctx.con.execute("""
+            INSERT INTO seen (user_id, num) SELECT * FROM unnest($1::bigint[], $2::smallint[])
+            ON CONFLICT DO NOTHING
+            """, [owner for owner, _ in seen], [num for _, num in seen])
+    return evolved
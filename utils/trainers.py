@@ -0,0 +1,113 @@
+from collections import OrderedDict, Counter
+import json
+
+from utils.listener import Listener
+
+
+class TrainerCache(Listener):
+    """A bounded LRU of `trainers` rows.
+
+    A miss reads the row with a plain SELECT and only inserts it when the
+    trainer does not exist yet, so reads never write to the table.
+    Callers get a copy of the row, so changing it never changes the cache.
+
+    The inventory is the only column that changes. The cache is kept
+    up to date with the inventory returned by every update, and a failed
+    update evicts the trainer, since another process may have changed it.
+
+    Inventories changed by other processes sharing the DB are received
+    through the NOTIFY sent by the `trainers_notify` trigger, see
+    :class:`utils.listener.Listener`. Every trainer is evicted when the
+    listening connection is reconnected, since changes may have been missed.
+
+    Parameters
+    ----------
+    statements: :class:`utils.statements.StatementRegistry`
+        The registry to run the `trainer_get` and `trainer_create` statements with.
+    dsn: str
+        The DSN to connect to the DB with.
+    Optional[max_size: int]
+        The maximum amount of trainers to keep.
+    Optional[retry_interval: float]
+        The maximum seconds between attempts to reconnect.
+
+    Attributes
+    ----------
+    hits: int
+        The amount of lookups served from memory.
+    misses: int
+        The amount of lookups that read the DB.
+    """
+    channel = 'trainers'
+
+    def __init__(self, statements, dsn, *, max_size=2048, retry_interval=60):
+        super().__init__(dsn, retry_interval=retry_interval)
+        self.statements = statements
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._rows = OrderedDict()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, user_id):
+        return user_id in self._rows
+
+    def reset(self, data):
+        self._rows.clear()
+
+    def apply(self, pid, payload):
+        change = json.loads(payload)
+        self.set_inventory(change['user_id'], change['inventory'])
+
+    @staticmethod
+    def _copy(row):
+        return {**row, 'inventory': Counter(row['inventory'])}
+
+    def _store(self, user_id, row):
+        self._rows[user_id] = row
+        self._rows.move_to_end(user_id)
+        while len(self._rows) > self.max_size:
+            self._rows.popitem(last=False)
+
+    async def get(self, con, user_id: int):
+        """Returns a copy of a trainer's row, creating the trainer if needed.
+
+        Parameters
+        ----------
+        con: Union[asyncpg.connection.Connection, :class:`utils.connection.LazyConnection`]
+            The connection to use on a miss.
+        user_id: int
+            The user ID of the trainer.
+
+        Returns
+        -------
+        dict:
+            The `trainers` row with its inventory as a :class:`collections.Counter`.
+        """
+        try:
+            row = self._rows[user_id]
+        except KeyError:
+            self.misses += 1
+            record = await self.statements.fetchrow(con, 'trainer_get', user_id)
+            if record is None:
+                record = await self.statements.fetchrow(con, 'trainer_create', user_id)
+            if record is None:  # Created by someone else since the SELECT.
+                record = await self.statements.fetchrow(con, 'trainer_get', user_id)
+            row = {**record, 'inventory': Counter(record['inventory'])}
+            self._store(user_id, row)
+        else:
+            self.hits += 1
+            self._rows.move_to_end(user_id)
+        return self._copy(row)
+
+    def set_inventory(self, user_id: int, inventory):
+        """Replaces a cached trainer's inventory with one read from the DB."""
+        row = self._rows.get(user_id)
+        if row is not None:
+            row['inventory'] = Counter(inventory)
+
+    def invalidate(self, user_id: int):
+        """Evicts a trainer so the next lookup reads the DB."""
+        self._rows.pop(user_id, None)
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+import discord
+
+
+class UserCache:
+    """Resolves user IDs without scanning every member.
+
+    Users are looked up in the client's user cache first. Users that
+    are not in it are fetched from Discord once and kept in a bounded LRU.
+
+    Parameters
+    ----------
+    bot: discord.ext.commands.Bot
+        The bot to look up and fetch users with.
+    Optional[max_size: int]
+        The maximum amount of fetched users to keep.
+    """
+    def __init__(self, bot, max_size=256):
+        self.bot = bot
+        self.max_size = max_size
+        self._fetched = OrderedDict()
+
+    def __len__(self):
+        return len(self._fetched)
+
+    async def get(self, user_id: int):
+        """Returns the user with an ID.
+
+        Returns
+        -------
+        Union[discord.User, None]:
+            The user, or `None` if no user exists with the ID.
+        """
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return user
+        try:
+            user = self._fetched[user_id]
+        except KeyError:
+            try:
+                user = await self.bot.get_user_info(user_id)
+            except discord.NotFound:
+                user = None
+            except discord.HTTPException:
+                return None
+            self._fetched[user_id] = user
+            if len(self._fetched) > self.max_size:
+                self._fetched.popitem(last=False)
+        else:
+            self._fetched.move_to_end(user_id)
+        return user
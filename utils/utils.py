@@ -10,10 +10,10 @@ def wrap(to_wrap, wrap_with, sep=' '):
 
 def unique(it, key):
     new = []
-    added = []
+    added = set()
     for i in it:
         k = key(i)
         if k not in added:
             new.append(i)
-            added.append(k)
+            added.add(k)
     return new